@@ -27,6 +27,7 @@ setup(
     requires=[],
     extras_require={
         'sphinx': ['sphinx'],
+        'numpy': ['numpy'],
     },
     zip_safe=True,
     keywords='graphql client http endpoint',
@@ -8,7 +8,8 @@ This package provide the following modules:
    interpret queries. Submodule :mod:`sgqlc.types.datetime` will
    provide bindings for :mod:`datetime` and ISO 8601, while
    :mod:`sgqlc.types.relay` will expose ``Node``, ``PageInfo`` and
-   ``Connection``.
+   ``Connection``. Submodule :mod:`sgqlc.types.snapshot` saves and
+   loads precompiled schemas, for fast startup.
 
  - :mod:`sgqlc.operation`: use declared types to generate and
    interpret queries.
@@ -18,6 +19,9 @@ This package provide the following modules:
    :class:`sgqlc.endpoint.http.HTTPEndpoint` using
    :func:`urllib.request.urlopen()`.
 
+ - :mod:`sgqlc.codegen`: generate modules declaring :mod:`sgqlc.types`
+   from GraphQL introspection results.
+
 :license: ISC
 '''
 
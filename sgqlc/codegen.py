@@ -0,0 +1,534 @@
+'''
+sgqlc - Simple GraphQL Client
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Schema Code Generator
+=====================
+
+Generates Python modules declaring :mod:`sgqlc.types` from the
+result of a GraphQL introspection query, so huge schemas, such as
+GitHub's, do not need to be written by hand.
+
+The generated code is tuned for load speed:
+
+ - every field is an explicit :class:`sgqlc.types.Field` with its
+   ``graphql_name``, nothing is left to be guessed by the metaclass;
+
+ - types are ordered so fields reference previously declared types,
+   string forward references (resolved by name on first use) are
+   only used to break cycles;
+
+ - optionally the schema is ``deferred``, see
+   :class:`sgqlc.types.Schema`, only creating fields of types used
+   by the process. Loading may be even faster with
+   :mod:`sgqlc.types.snapshot`.
+
+Types matching those provided by :mod:`sgqlc.types.datetime` and
+:mod:`sgqlc.types.relay` (``Node`` and ``PageInfo``) are reused.
+
+This module provides command line utility:
+
+.. code-block:: console
+
+   $ python3 -m sgqlc.endpoint.http http://server.com/graphql \\
+         "$(python3 -c 'import sgqlc.codegen as c; print(c.query)')" \\
+         > schema.json
+   $ python3 -m sgqlc.codegen schema.json my_schema.py
+
+:license: ISC
+'''
+
+__docformat__ = 'reStructuredText en'
+
+__all__ = ('CodeGen', 'generate', 'query')
+
+import json
+import keyword
+import re
+
+query = '''\
+query IntrospectionQuery {
+  __schema {
+    queryType { name }
+    mutationType { name }
+    subscriptionType { name }
+    types { ...FullType }
+  }
+}
+
+fragment FullType on __Type {
+  kind
+  name
+  description
+  fields(includeDeprecated: true) {
+    name
+    description
+    args { ...InputValue }
+    type { ...TypeRef }
+  }
+  inputFields { ...InputValue }
+  interfaces { ...TypeRef }
+  enumValues(includeDeprecated: true) { name }
+  possibleTypes { ...TypeRef }
+}
+
+fragment InputValue on __InputValue {
+  name
+  type { ...TypeRef }
+  defaultValue
+}
+
+fragment TypeRef on __Type {
+  kind
+  name
+  ofType {
+    kind
+    name
+    ofType {
+      kind
+      name
+      ofType {
+        kind
+        name
+        ofType { kind name }
+      }
+    }
+  }
+}
+'''
+'''Introspection query with everything needed by :class:`CodeGen`.'''
+
+builtin_scalars = ('Int', 'Float', 'String', 'Boolean', 'ID')
+
+# GraphQL name: (module, field signature) provided by sgqlc
+provided_types = {
+    'Time': ('sgqlc.types.datetime', None),
+    'Date': ('sgqlc.types.datetime', None),
+    'DateTime': ('sgqlc.types.datetime', None),
+    'Node': ('sgqlc.types.relay', (('id', 'ID!'),)),
+    'PageInfo': ('sgqlc.types.relay', (
+        ('endCursor', 'String'),
+        ('hasNextPage', 'Boolean!'),
+        ('hasPreviousPage', 'Boolean!'),
+        ('startCursor', 'String'),
+    )),
+}
+
+_re_camel = re.compile('([a-z0-9])([A-Z])')
+_re_literal_token = re.compile(r'''[\s,]*(?:
+    (?P<punctuator>[\[\]{}:])
+  | (?P<number>-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?)
+  | (?P<string>"(?:[^"\\\n]|\\.)*")
+  | (?P<name>[_A-Za-z][_0-9A-Za-z]*)
+)''', re.VERBOSE)
+_re_literal_end = re.compile(r'[\s,]*$')
+_literal_names = {'true': True, 'false': False, 'null': None}
+
+
+def to_python_name(graphql_name):
+    '''Converts a GraphQL name, ``aName``, to Python: ``a_name``.
+
+    >>> to_python_name('createdAt')
+    'created_at'
+    >>> to_python_name('isURL')
+    'is_url'
+    >>> to_python_name('from')
+    'from_'
+    '''
+    name = _re_camel.sub(r'\1_\2', graphql_name).lower().lstrip('_')
+    if keyword.iskeyword(name) or not name:
+        name += '_'
+    return name
+
+
+def type_name(ref):
+    '''GraphQL notation of introspection type reference.
+
+    >>> type_name({'kind': 'NON_NULL', 'ofType': {'kind': 'LIST',
+    ...     'ofType': {'kind': 'OBJECT', 'name': 'Issue'}}})
+    '[Issue]!'
+    '''
+    kind = ref['kind']
+    if kind == 'NON_NULL':
+        return type_name(ref['ofType']) + '!'
+    elif kind == 'LIST':
+        return '[' + type_name(ref['ofType']) + ']'
+    return ref['name']
+
+
+def _named_type(name):
+    return name.strip('[]!')
+
+
+def _literal_tokens(text):
+    tokens = []
+    pos = 0
+    while not _re_literal_end.match(text, pos):
+        m = _re_literal_token.match(text, pos)
+        if m is None:
+            raise ValueError('unexpected %r' % (text[pos:],))
+        pos = m.end()
+        tokens.append((m.lastgroup, m.group(m.lastgroup)))
+    tokens.reverse()  # consumed with pop()
+    return tokens
+
+
+def _parse_literal(tokens):
+    kind, text = tokens.pop()
+    if kind in ('number', 'string'):
+        return json.loads(text)  # same notation and escapes
+    elif kind == 'name':
+        return _literal_names.get(text, text)  # others are enumerations
+    elif text == '[':
+        r = []
+        while tokens[-1][1] != ']':
+            r.append(_parse_literal(tokens))
+        tokens.pop()
+        return r
+    elif text == '{':
+        r = {}
+        while tokens[-1][1] != '}':
+            kind, name = tokens.pop()
+            if kind != 'name' or tokens.pop()[1] != ':':
+                raise ValueError('expected name: %r' % (name,))
+            r[name] = _parse_literal(tokens)
+        tokens.pop()
+        return r
+    raise ValueError('unexpected %r' % (text,))
+
+
+def _parse_default(value):
+    '''Python value of a GraphQL literal, such as ``defaultValue``.
+
+    Input objects are mappings of GraphQL field name to value, while
+    enumerations are kept as strings.
+
+    >>> _parse_default('{states: [OPEN, CLOSED], first: 10, after: null}')
+    {'states': ['OPEN', 'CLOSED'], 'first': 10, 'after': None}
+    >>> _parse_default('[1.5, "a \\\\"b\\\\"", true]')
+    [1.5, 'a "b"', True]
+    >>> _parse_default('{states: [OPEN}')
+    Traceback (most recent call last):
+      ...
+    ValueError: invalid GraphQL value: '{states: [OPEN}'
+    '''
+    if value is None:
+        return None
+    try:
+        tokens = _literal_tokens(value)
+        result = _parse_literal(tokens)
+        if tokens:
+            raise ValueError('unexpected %r' % (tokens[-1][1],))
+    except (IndexError, ValueError) as exc:
+        raise ValueError('invalid GraphQL value: %r' % (value,)) from exc
+    return result
+
+
+class CodeGen:
+    '''Generates Python code from introspection results.
+
+    :param schema: the ``__schema`` object of the introspection result.
+    :type schema: dict
+
+    :param schema_name: the variable with the generated
+      :class:`sgqlc.types.Schema`.
+    :type schema_name: str
+
+    :param deferred: whether the generated schema is ``deferred``.
+    :type deferred: bool
+
+    :param docstrings: whether to output type descriptions.
+    :type docstrings: bool
+    '''
+
+    def __init__(self, schema, schema_name='schema', deferred=False,
+                 docstrings=False):
+        self.types = [t for t in schema['types']
+                      if not t['name'].startswith('__')]
+        self.by_name = {t['name']: t for t in self.types}
+        self.schema_name = schema_name
+        self.deferred = deferred
+        self.docstrings = docstrings
+        self.declared = set(builtin_scalars)
+        self.reused = {}
+        self.removed = []
+        self.imports = set()
+        self.find_provided()
+
+    def find_provided(self):
+        for name, (module, signature) in provided_types.items():
+            t = self.by_name.get(name)
+            if t is None:
+                continue
+            fields = t.get('fields') or t.get('inputFields') or ()
+            actual = tuple(sorted(
+                (f['name'], type_name(f['type'])) for f in fields))
+            self.imports.add(module)
+            if signature is None or actual == signature:
+                self.reused[name] = module
+                self.declared.add(name)
+            else:
+                self.removed.append((name, module))
+
+    def hard_deps(self, t):
+        # must be declared before t: bases and union members
+        refs = (t.get('interfaces') or ()) if t['kind'] != 'UNION' else \
+            (t.get('possibleTypes') or ())
+        return [r['name'] for r in refs]
+
+    def soft_deps(self, t):
+        deps = []
+        for f in (t.get('fields') or []) + (t.get('inputFields') or []):
+            deps.append(_named_type(type_name(f['type'])))
+            for a in f.get('args') or ():
+                deps.append(_named_type(type_name(a['type'])))
+        return deps
+
+    def deps(self, t):
+        for d in self.hard_deps(t):
+            yield d, True
+        for d in self.soft_deps(t):
+            yield d, False
+
+    def sorted_types(self):
+        '''Types in declaration order.
+
+        Dependencies are declared first whenever possible, cycles are
+        broken by references that will use strings.
+        '''
+        order = []
+        done = set(self.declared)
+        path = set()
+
+        def can_visit(name, hard):
+            if name in done or name in path or name not in self.by_name:
+                return False
+            return hard or not any(
+                d in path for d in self.hard_deps(self.by_name[name]))
+
+        def visit(name):
+            # iterative depth first search, schemas may be deeper than
+            # the recursion limit
+            stack = [(name, self.deps(self.by_name[name]))]
+            path.add(name)
+            while stack:
+                name, deps = stack[-1]
+                for d, hard in deps:
+                    if can_visit(d, hard):
+                        stack.append((d, self.deps(self.by_name[d])))
+                        path.add(d)
+                        break
+                else:
+                    stack.pop()
+                    path.discard(name)
+                    done.add(name)
+                    order.append(self.by_name[name])
+
+        kinds = ('SCALAR', 'ENUM', 'INPUT_OBJECT', 'INTERFACE', 'OBJECT',
+                 'UNION')
+        for kind in kinds:
+            for t in self.types:
+                if t['kind'] == kind and t['name'] not in done:
+                    visit(t['name'])
+        return order
+
+    def type_ref(self, ref):
+        name = type_name(ref)
+        named = _named_type(name)
+        if named not in self.declared:
+            return repr(name)  # forward reference, resolved by name
+        return self._wrap(name, named)
+
+    def _wrap(self, name, named):
+        if name.endswith('!'):
+            return 'sgqlc.types.non_null(%s)' % self._wrap(name[:-1], named)
+        elif name.startswith('['):
+            return 'sgqlc.types.list_of(%s)' % self._wrap(name[1:-1], named)
+        return named
+
+    def gen_header(self):
+        yield 'import sgqlc.types'
+        for module in sorted(self.imports):
+            yield 'import ' + module
+        yield ''
+        yield ''
+        yield '%s = sgqlc.types.Schema(%s)' % (
+            self.schema_name, 'deferred=True' if self.deferred else '')
+        for name, module in self.removed:
+            yield '%s -= %s.%s' % (self.schema_name, module, name)
+        yield ''
+        for name in builtin_scalars:
+            yield '%s = sgqlc.types.%s' % (name, name)
+        for name, module in sorted(self.reused.items()):
+            yield '%s = %s.%s' % (name, module, name)
+
+    def gen_class(self, t, bases):
+        yield ''
+        yield ''
+        yield 'class %s(%s):' % (t['name'], ', '.join(bases))
+        if self.docstrings and t.get('description'):
+            yield '    %r' % (t['description'],)
+        yield '    __schema__ = %s' % (self.schema_name,)
+
+    def gen_scalar(self, t):
+        yield from self.gen_class(t, ['sgqlc.types.Scalar'])
+
+    def gen_enum(self, t):
+        yield from self.gen_class(t, ['sgqlc.types.Enum'])
+        choices = tuple(v['name'] for v in t['enumValues'])
+        yield '    __choices__ = %r' % (choices,)
+
+    def gen_union(self, t):
+        yield from self.gen_class(t, ['sgqlc.types.Union'])
+        members = self.hard_deps(t)
+        yield '    __types__ = (%s%s)' % (
+            ', '.join(members), ',' if len(members) == 1 else '')
+
+    def python_value(self, value, name):
+        '''Value of GraphQL type ``name`` as given to ``sgqlc.types``.
+
+        Input objects are mappings of Python field name to value,
+        see :func:`sgqlc.types.Input.__to_graphql_input__()`.
+
+        >>> gen = CodeGen({'types': [{
+        ...     'kind': 'INPUT_OBJECT', 'name': 'Order', 'inputFields': [{
+        ...         'name': 'fieldName',
+        ...         'type': {'kind': 'SCALAR', 'name': 'String'},
+        ...     }],
+        ... }]})
+        >>> gen.python_value([{'fieldName': 'createdAt'}], '[Order!]!')
+        [{'field_name': 'createdAt'}]
+        '''
+        name = name.rstrip('!')
+        if name.startswith('[') and isinstance(value, list):
+            return [self.python_value(v, name[1:-1]) for v in value]
+        t = self.by_name.get(name)
+        if t is None or t['kind'] != 'INPUT_OBJECT' or \
+                not isinstance(value, dict):
+            return value
+        types = {f['name']: type_name(f['type']) for f in t['inputFields']}
+        return {to_python_name(k): self.python_value(v, types.get(k, ''))
+                for k, v in value.items()}
+
+    def gen_arg(self, a):
+        '''Code of an argument and a comment, if its default is invalid.'''
+        s = 'sgqlc.types.Arg(%s, graphql_name=%r' % (
+            self.type_ref(a['type']), a['name'])
+        try:
+            default = _parse_default(a.get('defaultValue'))
+        except ValueError:
+            return s + ')', '  # default: ' + ' '.join(
+                a['defaultValue'].split())
+        if default is not None:
+            default = self.python_value(default, type_name(a['type']))
+            s += ', default=%r' % (default,)
+        return s + ')', ''
+
+    def gen_field(self, f, used_names):
+        name = to_python_name(f['name'])
+        while name in used_names:
+            name += '_'
+        used_names.add(name)
+
+        s = ['    %s = sgqlc.types.Field(%s, graphql_name=%r' % (
+            name, self.type_ref(f['type']), f['name'])]
+        args = f.get('args')
+        if args:
+            s.append(', args=sgqlc.types.ArgDict((')
+            for a in args:
+                s.append('\n        (%r, %s),%s' % (
+                    (to_python_name(a['name']),) + self.gen_arg(a)))
+            s.append('\n    ))')
+        s.append(')')
+        return ''.join(s)
+
+    @staticmethod
+    def field_signature(f):
+        args = tuple((a['name'], type_name(a['type']), a.get('defaultValue'))
+                     for a in f.get('args') or ())
+        return (f['name'], type_name(f['type']), args)
+
+    def gen_container(self, t):
+        kind = t['kind']
+        interfaces = self.hard_deps(t)
+        if kind == 'INPUT_OBJECT':
+            bases = ['sgqlc.types.Input']
+            fields = t['inputFields']
+        elif kind == 'INTERFACE':
+            bases = ['sgqlc.types.Interface'] + interfaces
+            fields = t['fields']
+        else:
+            bases = ['sgqlc.types.Type'] + interfaces
+            fields = t['fields']
+
+        # fields declared by interfaces are inherited, unless changed
+        inherited = set()
+        for i in interfaces:
+            i_fields = self.by_name[i].get('fields') or ()
+            inherited.update(self.field_signature(f) for f in i_fields)
+        used_names = set()
+        for f in fields or ():
+            if self.field_signature(f) in inherited:
+                used_names.add(to_python_name(f['name']))
+
+        yield from self.gen_class(t, bases)
+        for f in fields or ():
+            if self.field_signature(f) not in inherited:
+                yield self.gen_field(f, used_names)
+
+    def generate(self):
+        '''Python source lines of the module.'''
+        yield from self.gen_header()
+        generators = {
+            'SCALAR': self.gen_scalar,
+            'ENUM': self.gen_enum,
+            'UNION': self.gen_union,
+        }
+        for t in self.sorted_types():
+            yield from generators.get(t['kind'], self.gen_container)(t)
+            self.declared.add(t['name'])
+
+
+def generate(introspection, out, **kwargs):
+    '''Write the Python module declaring the introspected schema.
+
+    :param introspection: the introspection result, either the whole
+      response (with ``data``) or its ``__schema`` object.
+    :type introspection: dict
+
+    :param out: where to write the Python source.
+    :type out: text file
+
+    Other keyword arguments are given to :class:`CodeGen`.
+    '''
+    schema = introspection.get('data', introspection)
+    schema = schema.get('__schema', schema)
+    for line in CodeGen(schema, **kwargs).generate():
+        out.write(line)
+        out.write('\n')
+
+
+if __name__ == '__main__':
+    import argparse
+    import sys
+
+    ap = argparse.ArgumentParser(
+        description='Generate sgqlc schema module from introspection JSON',
+    )
+    ap.add_argument('schema.json', type=argparse.FileType('r'),
+                    help='The introspection result, as JSON.')
+    ap.add_argument('schema.py', type=argparse.FileType('w'), nargs='?',
+                    default=sys.stdout,
+                    help='The Python module to write. Default: stdout')
+    ap.add_argument('--schema-name', '-n', default='schema',
+                    help='The schema variable name. Default: schema')
+    ap.add_argument('--deferred', '-d', action='store_true',
+                    help='Only create fields of types used at runtime.')
+    ap.add_argument('--docstrings', action='store_true',
+                    help='Include type descriptions as docstrings.')
+
+    args = vars(ap.parse_args())
+    generate(json.load(args['schema.json']), args['schema.py'],
+             schema_name=args['schema_name'],
+             deferred=args['deferred'],
+             docstrings=args['docstrings'])
@@ -12,9 +12,13 @@ Base interface for endpoints.
 
 __docformat__ = 'reStructuredText en'
 
-__all__ = ('BaseEndpoint',)
+__all__ = ('BaseEndpoint', 'JSONStreamParser')
 
+import codecs
+import json
+import json.decoder
 import logging
+import re
 
 
 class BaseEndpoint:
@@ -172,3 +176,154 @@ class BaseEndpoint:
                                      colmark[0] * column,
                                      colmark[1]))
         return s
+
+
+class JSONStreamParser:
+    '''Incrementally parse a JSON document, yielding elements of a list.
+
+    The document is read in chunks from a binary file-like object
+    ``fp`` and the elements of the list reached by ``path``, a
+    sequence of object keys such as ``('data', 'repository',
+    'issues', 'nodes')``, are yielded as soon as they are parsed. Thus
+    the memory usage is bounded by the size of a single element
+    rather than the whole document.
+
+    All other values are kept in ``document``, with the streamed list
+    left empty, so once the iteration is done one may check for
+    ``errors`` and other members, such as ``pageInfo``.
+
+    >>> import io
+    >>> fp = io.BytesIO(b'{"data": {"nodes": [{"a": 1}, {"a": 2}], "n": 2}}')
+    >>> parser = JSONStreamParser(fp, ('data', 'nodes'), chunk_size=4)
+    >>> list(parser)
+    [{'a': 1}, {'a': 2}]
+    >>> parser.document
+    {'data': {'nodes': [], 'n': 2}}
+    '''
+
+    __re_number_tail = re.compile(r'[0-9.eE+-]*')
+
+    def __init__(self, fp, path, chunk_size=65536, encoding='utf-8'):
+        '''
+        :param fp: binary file-like object providing ``read(size)``.
+
+        :param path: sequence of object keys leading to the list to
+          stream. If the value at that path is not a list, such as
+          ``null``, nothing is yielded and it's stored in ``document``.
+        :type path: tuple
+
+        :param chunk_size: the amount of bytes to read at once.
+        :type chunk_size: int
+
+        :param encoding: the document encoding.
+        :type encoding: str
+        '''
+        self.fp = fp
+        self.path = tuple(path)
+        self.chunk_size = chunk_size
+        self.document = None
+        self.__text_decoder = codecs.getincrementaldecoder(encoding)()
+        self.__json_decoder = json.JSONDecoder()
+        self.__buf = ''
+        self.__pos = 0
+        self.__eof = False
+
+    def __iter__(self):
+        self.document = {}
+        yield from self.__parse_member(self.document, None, 0)
+        self.document = self.document[None]
+        if self.__peek():
+            raise self.__error('Extra data')
+
+    def __error(self, msg):
+        return json.JSONDecodeError(msg, self.__buf, self.__pos)
+
+    def __read(self, size):
+        if self.__eof:
+            return False
+        # drop what was already consumed, positions are relative to it
+        self.__buf = self.__buf[self.__pos:]
+        self.__pos = 0
+        chunk = self.fp.read(size)
+        if not chunk:
+            self.__eof = True
+        self.__buf += self.__text_decoder.decode(chunk, final=not chunk)
+        return True
+
+    def __peek(self):
+        '''Skip whitespace and return next character, empty at EOF.'''
+        while True:
+            self.__pos = json.decoder.WHITESPACE.match(
+                self.__buf, self.__pos).end()
+            if self.__pos < len(self.__buf):
+                return self.__buf[self.__pos]
+            if not self.__read(self.chunk_size):
+                return ''
+
+    def __expect(self, chars):
+        c = self.__peek()
+        if not c or c not in chars:
+            raise self.__error('Expecting one of %r' % (chars,))
+        self.__pos += 1
+        return c
+
+    def __parse_value(self):
+        while True:
+            self.__peek()
+            try:
+                value, end = self.__json_decoder.raw_decode(
+                    self.__buf, self.__pos)
+            except json.JSONDecodeError:
+                # incomplete value: read more, doubling the buffer
+                if self.__read(max(self.chunk_size, len(self.__buf))):
+                    continue
+                raise
+            # numbers may continue in the next chunk, ie: "1" + "2.5"
+            if isinstance(value, (int, float)) and not self.__eof and \
+               self.__re_number_tail.match(self.__buf, end).end() == \
+               len(self.__buf):
+                self.__read(self.chunk_size)
+                continue
+            self.__pos = end
+            return value
+
+    def __parse_member(self, target, key, depth):
+        c = self.__peek()
+        if depth == len(self.path) and c == '[':
+            target[key] = []
+            yield from self.__parse_list()
+        elif depth < len(self.path) and c == '{':
+            target[key] = child = {}
+            yield from self.__parse_object(child, depth)
+        else:
+            target[key] = self.__parse_value()
+
+    def __parse_object(self, target, depth):
+        self.__expect('{')
+        if self.__peek() == '}':
+            self.__pos += 1
+            return
+
+        path_key = self.path[depth]
+        while True:
+            key = self.__parse_value()
+            if not isinstance(key, str):
+                raise self.__error('Expecting property name')
+            self.__expect(':')
+            if key == path_key:
+                yield from self.__parse_member(target, key, depth + 1)
+            else:
+                target[key] = self.__parse_value()
+            if self.__expect(',}') == '}':
+                return
+
+    def __parse_list(self):
+        self.__expect('[')
+        if self.__peek() == ']':
+            self.__pos += 1
+            return
+
+        while True:
+            yield self.__parse_value()
+            if self.__expect(',]') == ']':
+                return
@@ -26,7 +26,7 @@ import logging
 import urllib.error
 import urllib.request
 
-from .base import BaseEndpoint
+from .base import BaseEndpoint, JSONStreamParser
 
 
 class HTTPEndpoint(BaseEndpoint):
@@ -100,6 +100,8 @@ class HTTPEndpoint(BaseEndpoint):
           that this is converted using ``bytes()``, thus one may pass
           an object implementing ``__bytes__()`` method to return the
           query, eventually in more compact form (no indentation, etc).
+          A :class:`sgqlc.operation.PreparedOperation` provides the
+          encoded request body instead, only the variables are encoded.
         :type query: :class:`str` or :class:`bytes`.
 
         :param variables: variables (dict) to use with
@@ -109,6 +111,7 @@ class HTTPEndpoint(BaseEndpoint):
 
         :param operation_name: if more than one operation is listed in
           ``query``, then it should specify the one to be executed.
+          Ignored for prepared operations, these use their own name.
         :type operation_name: str
 
         :param extra_headers: dict with extra HTTP headers to use.
@@ -122,18 +125,113 @@ class HTTPEndpoint(BaseEndpoint):
           errors. Note that both ``data`` and ``errors`` may be returned!
         :rtype: dict
         '''
-        if isinstance(query, bytes):
-            query = query.decode('utf-8')
-        elif not isinstance(query, str):
-            # allows sgqlc.operation.Operation to be passed
-            # and generate compact representation of the queries
-            query = bytes(query).decode('utf-8')
-
-        post_data = json.dumps({
-            'query': query,
-            'variables': variables,
-            'operationName': operation_name,
-        }).encode('utf-8')
+        query, req = self._prepare_request(
+            query, variables, operation_name, extra_headers)
+        try:
+            with self.urlopen(req, timeout=timeout) as f:
+                body = f.read().decode('utf-8')
+                try:
+                    data = json.loads(body)
+                    if data and data.get('errors'):
+                        return self._log_graphql_error(query, data)
+                    return data
+                except json.JSONDecodeError as exc:
+                    return self._log_json_error(body, exc)
+        except urllib.error.HTTPError as exc:
+            return self._log_http_error(query, req, exc)
+
+    def stream(self, query, path, variables=None, operation_name=None,
+               extra_headers=None, timeout=None, chunk_size=65536):
+        '''Calls the GraphQL endpoint, streaming elements of a list.
+
+        Instead of reading and decoding the whole response before
+        returning, it's incrementally parsed using
+        :class:`sgqlc.endpoint.base.JSONStreamParser` and this
+        generator yields each element of the list at ``path`` as soon
+        as it's parsed, thus the memory usage is bounded by a single
+        element.
+
+        If ``query`` is an :class:`sgqlc.operation.Operation`, then
+        ``path`` is made of field names (or aliases) and the elements
+        are already interpreted by the operation types, see
+        :func:`sgqlc.operation.Operation.__decode_path__()`. Otherwise
+        ``path`` is made of JSON keys inside ``data`` and the JSON
+        elements are yielded as is:
+
+        .. code-block:: python
+
+          for issue in endpoint.stream(op, 'repository.issues.nodes'):
+              print(issue.number)
+
+        Errors are handled as in ``__call__()``. The remaining of the
+        response, with the streamed list left empty, is the
+        generator's return value (``StopIteration.value``), it may be
+        used to check for ``errors`` and other fields, like
+        ``pageInfo``.
+
+        :param query: the GraphQL query or mutation to execute.
+        :type query: :class:`str`, :class:`bytes` or
+          :class:`sgqlc.operation.Operation`
+
+        :param path: dot separated names to reach the list to stream
+          from, such as ``'repository.issues.nodes'``.
+        :type path: str
+
+        :param chunk_size: the amount of bytes to read at once.
+        :type chunk_size: int
+
+        Other parameters are the same as in ``__call__()``.
+        '''
+        decode_path = getattr(query, '__decode_path__', None)
+        if decode_path is not None:
+            json_keys, decode = decode_path(path)
+        else:
+            json_keys = ['data'] + path.split('.')
+            decode = None
+
+        query, req = self._prepare_request(
+            query, variables, operation_name, extra_headers)
+        try:
+            with self.urlopen(req, timeout=timeout) as f:
+                parser = JSONStreamParser(f, json_keys, chunk_size)
+                try:
+                    for v in parser:
+                        yield v if decode is None else decode(v)
+                except json.JSONDecodeError as exc:
+                    return self._log_json_error(exc.doc, exc)
+                data = parser.document
+                if data and data.get('errors'):
+                    return self._log_graphql_error(query, data)
+                return data
+        except urllib.error.HTTPError as exc:
+            return self._log_http_error(query, req, exc)
+
+    def _prepare_request(self, query, variables, operation_name,
+                         extra_headers):
+        '''Create the :class:`urllib.request.Request` to execute query.
+
+        :return: the query as string and the request object.
+        :rtype: tuple
+        '''
+        request_body = getattr(query, '__request_body__', None)
+        if request_body is not None:
+            # sgqlc.operation.PreparedOperation: query and operation
+            # name are already encoded, only variables are
+            post_data = request_body(variables)
+            query = str(query)
+        else:
+            if isinstance(query, bytes):
+                query = query.decode('utf-8')
+            elif not isinstance(query, str):
+                # allows sgqlc.operation.Operation to be passed
+                # and generate compact representation of the queries
+                query = bytes(query).decode('utf-8')
+
+            post_data = json.dumps({
+                'query': query,
+                'variables': variables,
+                'operationName': operation_name,
+            }).encode('utf-8')
         headers = self.base_headers.copy()
         if extra_headers:
             headers.update(extra_headers)
@@ -147,18 +245,7 @@ class HTTPEndpoint(BaseEndpoint):
 
         req = urllib.request.Request(
             url=self.url, data=post_data, headers=headers)
-        try:
-            with urllib.request.urlopen(req, timeout=timeout) as f:
-                body = f.read().decode('utf-8')
-                try:
-                    data = json.loads(body)
-                    if data and data.get('errors'):
-                        return self._log_graphql_error(query, data)
-                    return data
-                except json.JSONDecodeError as exc:
-                    return self._log_json_error(body, exc)
-        except urllib.error.HTTPError as exc:
-            return self._log_http_error(query, req, exc)
+        return query, req
 
     def _log_http_error(self, query, req, exc):
         '''Log :exc:`urllib.error.HTTPError`, converting to
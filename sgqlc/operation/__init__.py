@@ -41,9 +41,41 @@ to understand the Python mapping::
 
    parent.sibling.x.y()
 
+Fields of :class:`sgqlc.types.Interface` and :class:`sgqlc.types.Union`
+automatically select ``__typename``, so results are decoded as the
+actual type of each object. Fields of such types are selected with
+inline fragments, using ``__as__()``:
+
+.. code-block:: python
+
+   op = Operation(Query)
+   node = op.node(id='...')
+   node.id()
+   node.__as__(Issue).number()  # ... on Issue { number }
+
+   obj = op + data
+   if isinstance(obj.node, Issue):
+       print(obj.node.number)
+
+Operations executed many times, only changing their variables, may be
+prepared with :class:`PreparedOperation`, which renders and encodes
+them once:
+
+.. code-block:: python
+
+   op = Operation(Query, id=non_null(ID))
+   op.node(id=Variable('id')).id()
+
+   prepared = PreparedOperation(op)
+   for node_id in ids:
+       obj = prepared + endpoint(prepared, {'id': node_id})
+
 :class:`Operation` implements ``__str__()`` and ``__repr__()`` to
 generate the GraphQL query for you. It also provide ``__bytes__()`` to
-produce compact output, without indentation. It can be passed to
+produce minified output, the shortest equivalent text (see
+:func:`minify()`), which is what endpoints send. Selections repeated
+in many places are then written once, as named fragments (see
+:func:`Operation.__to_graphql__()`). It can be passed to
 :class:`sgqlc.endpoint.base.BaseEndpoint.__call__()` as is.
 
 Another convenience is the ``__add__()`` to apply the operation to a
@@ -64,11 +96,167 @@ objects:
 
 __docformat__ = 'reStructuredText en'
 
-__all__ = ('Operation',)
+__all__ = ('Operation', 'PreparedOperation', 'minify')
 
+import json
+import re
 from collections import OrderedDict
 
-from ..types import ContainerType, ArgDict, global_schema
+from ..types import ContainerType, Union, ArgDict, global_schema
+
+
+# strings are kept as is, comments are removed (not captured)
+_graphql_strings = re.compile(
+    r'("""(?:\\"""|[^"]|"(?!""))*"""|"(?:\\.|[^"\\\n\r])*")|#[^\n\r]*')
+_graphql_ignored = re.compile(r'[\s,\ufeff]+')
+_graphql_invalid = re.compile(r'[^ !$&().:=@\[\]{|}_0-9A-Za-z+-]')
+# spaces are only needed between names, numbers and "..." after numbers
+_graphql_space = re.compile(r'(?<![_0-9A-Za-z]) | (?![_0-9A-Za-z.])')
+_graphql_variable = re.compile(r'\$([_A-Za-z][_0-9A-Za-z]*)')
+
+
+def _short_name(i):
+    # a, b, ... z, A, ... Z, ba, bb, ...
+    letters = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    name = ''
+    while True:
+        i, r = divmod(i, len(letters))
+        name = letters[r] + name
+        if not i:
+            return name
+
+
+def minify(query, short_variables=None):
+    '''Shortest GraphQL text equivalent to ``query``.
+
+    Whitespace, commas and comments are removed, a single space is only
+    kept between names and numbers that would otherwise be merged.
+    Strings are kept as is.
+
+    >>> print(minify(\'\'\'query Q($first: Int = 10) {
+    ...   repo(owner: "o", name: "n") {
+    ...     issues(first: $first) { number, title }  # comment
+    ...     ... on Node { id }
+    ...   }
+    ... }\'\'\'))
+    query Q($first:Int=10){repo(owner:"o"name:"n"){issues(first:$first){\
+number title}...on Node{id}}}
+
+    Variables may also be renamed to short generated names, then
+    ``short_variables`` must be a dict, it's filled with the original
+    names mapped to the new ones (without ``$``), these must be used
+    to send the variables:
+
+    >>> names = {}
+    >>> minify('query Q($first: Int, $after: String) {'
+    ...        '  issues(first: $first, after: $after) { title } }', names)
+    'query Q($a:Int$b:String){issues(first:$a after:$b){title}}'
+    >>> names
+    {'first': 'a', 'after': 'b'}
+
+    :raise ValueError: if ``query`` has invalid characters.
+    '''
+    def rename(m):
+        name = m.group(1)
+        short = short_variables.get(name)
+        if short is None:
+            short = short_variables[name] = _short_name(len(short_variables))
+        return '$' + short
+
+    def minify_text(text):
+        text = _graphql_ignored.sub(' ', text).strip()
+        invalid = _graphql_invalid.search(text)
+        if invalid is not None:
+            raise ValueError('invalid GraphQL: %r' % (
+                text[invalid.start():invalid.start() + 20],))
+        if short_variables is not None:
+            text = _graphql_variable.sub(rename, text)
+        return _graphql_space.sub('', text)
+
+    pieces = _graphql_strings.split(query)
+    out = []
+    text = pieces[0]
+    for i in range(1, len(pieces), 2):
+        string = pieces[i]
+        if string is None:  # comment
+            text += ' ' + pieces[i + 1]
+            continue
+        out.append(minify_text(text))
+        out.append(string)
+        text = pieces[i + 1]
+    out.append(minify_text(text))
+    return ''.join(out)
+
+
+class _Fragments:
+    # named fragments extracted from structurally identical selection
+    # lists, see Operation.__to_graphql__(auto_fragments=True).
+    #
+    # Lists are identified by their type and contents, where nested
+    # lists are given by their identifiers, thus the tree is walked once
+    # and identifiers of nested lists are smaller than enclosing ones.
+
+    def __init__(self, selection_list):
+        self.ids = {}  # (type name, selections, casts) -> identifier
+        self.of = {}  # SelectionList -> identifier
+        self.lists = []  # identifier -> (type, first SelectionList)
+        self.sizes = []  # identifier -> estimated compact size
+        self.children = []  # identifier -> nested identifiers
+        self.names = OrderedDict()  # identifier -> fragment name
+        self.__extract(selection_list.__fragment_id__(self))
+
+    def add(self, selection_list, typ, selections, casts):
+        key = (typ.__name__, selections, casts)
+        fid = self.ids.get(key)
+        if fid is None:
+            fid = self.ids[key] = len(self.lists)
+            size = 2
+            children = []
+            for s in selections:
+                if s.__class__ is tuple:
+                    size += len(s[0]) + self.sizes[s[1]] + 1
+                    children.append(s[1])
+                else:
+                    size += len(s) + 1
+            for name, cid in casts:
+                size += len(name) + self.sizes[cid] + 7
+                children.append(cid)
+            self.lists.append((typ, selection_list))
+            self.sizes.append(size)
+            self.children.append(children)
+        self.of[selection_list] = fid
+        return fid
+
+    def __extract(self, root):
+        # lists used more than once are extracted if the definition and
+        # the spreads are shorter than repeating them, then their
+        # nested lists are used once, by the definition.
+        uses = [0] * len(self.lists)
+        uses[root] = 1
+        per_type = {}
+        for fid in range(root, -1, -1):
+            n = uses[fid]
+            if n > 1:
+                type_name = self.lists[fid][0].__name__
+                k = per_type.get(type_name, 0)
+                name = '%sFields%s' % (type_name, k + 1 if k else '')
+                cost = n * (3 + len(name)) + 13 + len(name) + len(type_name)
+                if (n - 1) * self.sizes[fid] > cost:
+                    per_type[type_name] = k + 1
+                    self.names[fid] = name
+                    n = 1
+            for cid in self.children[fid]:
+                uses[cid] += n
+
+    def name(self, selection_list):
+        return self.names.get(self.of.get(selection_list))
+
+    def write_definitions(self, write, indent, indent_string):
+        for fid, name in self.names.items():
+            write('\n\n')
+            write(indent_string * indent)
+            self.lists[fid][1].__write_fragment__(
+                write, name, indent, indent_string, self)
 
 
 class Selection:
@@ -137,7 +325,7 @@ class Selection:
 
     __slots__ = (
         '__alias__', '__field__', '__args__', '__field_selector',
-        '__selection_list',
+        '__selection_list', '__all_fields_selection_list',
     )
 
     def __init__(self, alias, field, args):
@@ -146,7 +334,8 @@ class Selection:
         self.__args__ = args
         self.__field_selector = {}
         self.__selection_list = None
-        if issubclass(field.type, ContainerType):
+        self.__all_fields_selection_list = None
+        if issubclass(field.type, (ContainerType, Union)):
             self.__selection_list = SelectionList(field.type)
 
     def __len__(self):
@@ -154,12 +343,37 @@ class Selection:
             return len(self.__selection_list)
         return 1
 
+    @property
+    def __selection_list__(self):
+        '''The :class:`sgqlc.operation.SelectionList` of the target
+        container type, or ``None`` for leaf (scalar) fields.
+
+        This is used to decode JSON data matching this selection.
+        '''
+        return self.__selection_list
+
     def __get_all_fields_selection_list(self):
-        q = SelectionList(self.__field__.type)
+        q = self.__all_fields_selection_list
+        if q is not None:
+            return q
+        q = self.__all_fields_selection_list = SelectionList(
+            self.__field__.type)
+        if issubclass(self.__field__.type, Union):
+            return q  # only __typename
         for f in self.__field__.type:
             q += Selection(None, f, {})
         return q
 
+    def __as__(self, typ):
+        '''Select fields of ``typ`` when the object is of that type.
+
+        See :func:`sgqlc.operation.SelectionList.__as__()`.
+        '''
+        if self.__selection_list is None:
+            raise ValueError('Field %r of %s is not a container type.' %
+                             (self.__field__, self.__field__.container))
+        return self.__selection_list.__as__(typ)
+
     def __fields__(self, *names, **names_and_args):
         '''Select fields of a container type.
 
@@ -233,25 +447,53 @@ class Selection:
             self[n](**args)
 
     def __to_graphql__(self, indent=0, indent_string='  '):
-        prefix = indent_string * indent
-
-        alias = ''
-        if self.__alias__:
-            alias = self.__alias__ + ': '
-
-        args = self.__field__.args.__to_graphql_input__(
+        chunks = []
+        self.__write_graphql__(chunks.append, indent, indent_string)
+        return ''.join(chunks)
+
+    def __write_graphql__(self, write, indent=0, indent_string='  ',
+                          fragments=None):
+        '''Render by calling ``write()`` with each chunk of text.
+
+        Nested selections write to the same function, instead of
+        returning their text to be copied by each enclosing level,
+        thus rendering is linear in the size of the text regardless of
+        the depth. The ``write`` is usually ``list.append``, the list
+        is joined once at the end, see ``__to_graphql__()``.
+
+        The ``fragments`` are the named fragments extracted by the
+        operation, nested selections are replaced by their spreads.
+        '''
+        field = self.__field__
+        args = field.args.__to_graphql_input__(
             self.__args__, indent, indent_string)
+        selections = self.__selection_list
+        if self.__alias__:
+            write('%s%s: %s%s' % (indent_string * indent, self.__alias__,
+                                  field.graphql_name, args))
+        else:
+            write('%s%s%s' % (indent_string * indent, field.graphql_name,
+                              args))
 
-        query = ''
-        if self.__selection_list is not None:
-            lst = []
-            selections = self.__selection_list
+        if selections is not None:
             if not selections:
                 selections = self.__get_all_fields_selection_list()
-            for s in selections:
-                lst.append(s.__to_graphql__(indent + 1, indent_string))
-            query = ' {\n%s\n%s}' % ('\n'.join(lst), prefix)
-        return prefix + alias + self.__field__.graphql_name + args + query
+            write(' ')
+            selections.__write_graphql__(write, indent, indent_string,
+                                         fragments)
+
+    def __fragment_key__(self, fragments):
+        field = self.__field__
+        header = field.graphql_name + field.args.__to_graphql_input__(
+            self.__args__, 0, '')
+        if self.__alias__:
+            header = self.__alias__ + ':' + header
+        selections = self.__selection_list
+        if selections is None:
+            return header
+        if not selections:
+            selections = self.__get_all_fields_selection_list()
+        return (header, selections.__fragment_id__(fragments))
 
     def __getattr__(self, name):
         try:
@@ -278,7 +520,7 @@ class Selection:
         return self.__to_graphql__()
 
     def __bytes__(self):
-        return bytes(self.__to_graphql__(indent_string=''), 'utf-8')
+        return bytes(minify(self.__to_graphql__(indent_string='')), 'utf-8')
 
 
 class Selector:
@@ -382,6 +624,8 @@ class Selector:
         selection = self()
         if name == '__fields__':
             return selection.__fields__
+        elif name == '__as__':
+            return selection.__as__
         return selection[name]
 
     def __str__(self):
@@ -411,13 +655,45 @@ class SelectionList:
 
     '''
 
-    __slots__ = ('__type', '__selectors', '__selections')
+    __slots__ = (
+        '__type', '__parent', '__fragment', '__selectors', '__selections',
+        '__casts__', '__decoders__', '__generation__', '__root_schema',
+    )
 
-    def __init__(self, typ):
-        assert issubclass(typ, ContainerType), str(typ) + ': not a container'
+    def __init__(self, typ, parent=None):
+        assert issubclass(typ, (ContainerType, Union)), \
+            str(typ) + ': not a container'
         self.__type = typ
+        # enclosing list: given for inline fragments (see __as__()),
+        # set by __iadd__() for selections of container fields
+        self.__parent = parent
+        self.__fragment = parent is not None
         self.__selectors = {}
         self.__selections = []
+        # type name -> (type, SelectionList), see __as__()
+        self.__casts__ = OrderedDict()
+        # type -> decoder steps, see ContainerTypeMeta.__decoder__()
+        self.__decoders__ = {}
+        # incremented when this list or nested ones change, this allows
+        # operations to cache their rendered text
+        self.__generation__ = 0
+        self.__root_schema = None
+
+    @property
+    def __schema__(self):
+        '''Schema of the operation, the type of the outermost list.
+
+        Interfaces decode objects as the type named by their
+        ``__typename`` in this schema, see
+        :func:`sgqlc.types.ContainerTypeMeta.__possible_type__()`.
+        '''
+        schema = self.__root_schema
+        if schema is None:
+            selection_list = self
+            while selection_list.__parent is not None:
+                selection_list = selection_list.__parent
+            schema = self.__root_schema = selection_list.__type.__schema__
+        return schema
 
     def __str__(self):
         return self.__to_graphql__()
@@ -426,23 +702,131 @@ class SelectionList:
         return self.__to_graphql__()
 
     def __bytes__(self):
-        return bytes(self.__to_graphql__(indent_string=''), 'utf-8')
+        return bytes(minify(self.__to_graphql__(indent_string='')), 'utf-8')
 
     def __to_graphql__(self, indent=0, indent_string='  '):
-        prefix = indent_string * indent
+        chunks = []
+        self.__write_graphql__(chunks.append, indent, indent_string)
+        return ''.join(chunks)
 
-        s = ['{']
-        for v in self.__selections:
-            s.append(v.__to_graphql__(indent + 1, indent_string))
+    def __write_graphql__(self, write, indent=0, indent_string='  ',
+                          fragments=None):
+        '''Render by calling ``write()`` with each chunk of text.
 
-        s.append(prefix + '}')
-        return '\n'.join(s)
+        See :func:`sgqlc.operation.Selection.__write_graphql__()`.
+        '''
+        if fragments is not None:
+            name = fragments.name(self)
+            if name is not None:
+                write('{\n%s...%s\n%s}' % (
+                    indent_string * (indent + 1), name,
+                    indent_string * indent))
+                return
+        self.__write_selections(write, indent, indent_string, fragments)
+
+    def __write_fragment__(self, write, name, indent, indent_string,
+                           fragments):
+        '''Render the named fragment ``name`` with these selections.'''
+        write('fragment %s on %s ' % (name, self.__type))
+        self.__write_selections(write, indent, indent_string, fragments)
+
+    def __write_selections(self, write, indent, indent_string, fragments):
+        child_prefix = indent_string * (indent + 1)
+        write('{')
+        if self.__type.__kind__ in ('interface', 'union'):
+            write('\n')
+            write(child_prefix)
+            write('__typename')
+
+        indent += 1
+        for v in self.__selections:
+            write('\n')
+            v.__write_graphql__(write, indent, indent_string, fragments)
+
+        for typ, cast in self.__casts__.values():
+            if cast:
+                write('\n')
+                write(child_prefix)
+                if fragments is not None:
+                    name = fragments.name(cast)
+                    if name is not None:
+                        write('...' + name)
+                        continue
+                write('... on %s ' % (typ,))
+                cast.__write_selections(write, indent, indent_string,
+                                        fragments)
+
+        write('\n')
+        write(indent_string * (indent - 1))
+        write('}')
 
     def __iter__(self):
         return iter(self.__selections)
 
     def __len__(self):
-        return len(self.__selections)
+        return len(self.__selections) + \
+            sum(len(cast) for _, cast in self.__casts__.values())
+
+    def __as__(self, typ):
+        '''Select fields of ``typ`` when the object is of that type.
+
+        This is a GraphQL inline fragment (``... on Type { fields }``),
+        used to select fields of the types implementing an interface or
+        members of a union. Objects are decoded as the type given by
+        their ``__typename``, with the fields selected here:
+
+        .. code-block:: python
+
+          node = op.node(id='...')
+          node.__as__(Issue).number()
+
+          obj = op + data
+          print(obj.node.number)  # obj.node is an Issue
+
+        :return: the :class:`sgqlc.operation.SelectionList` of ``typ``.
+        '''
+        name = typ.__name__
+        cast = self.__casts__.get(name)
+        if cast is None:
+            cast = SelectionList(typ, self)
+            self.__casts__[name] = (typ, cast)
+            self.__changed(True)
+        elif cast[0] is not typ:
+            raise ValueError('%s already has a selection on %s' % (
+                self.__type, name))
+        else:
+            cast = cast[1]
+        return cast
+
+    def __selections_for__(self, typ):
+        '''Selections used to decode objects of ``typ``.
+
+        These are the selections of this list followed by those given
+        to :func:`sgqlc.operation.SelectionList.__as__()` for ``typ``
+        or the interfaces it implements.
+        '''
+        yield from self.__selections
+        for cast_type, cast in self.__casts__.values():
+            if issubclass(typ, cast_type):
+                yield from cast.__selections_for__(typ)
+
+    def __fragment_id__(self, fragments):
+        selections = tuple(s.__fragment_key__(fragments)
+                           for s in self.__selections)
+        casts = tuple((typ.__name__, cast.__fragment_id__(fragments))
+                      for typ, cast in self.__casts__.values() if cast)
+        return fragments.add(self, self.__type, selections, casts)
+
+    def __changed(self, decoders):
+        # the rendered text of all enclosing lists changes, while only
+        # decoders of parents of inline fragments use their selections
+        selection_list = self
+        while selection_list is not None:
+            selection_list.__generation__ += 1
+            if decoders:
+                selection_list.__decoders__.clear()
+                decoders = selection_list.__fragment
+            selection_list = selection_list.__parent
 
     def __getitem__(self, name):
         s = self.__selectors.get(name)
@@ -459,6 +843,11 @@ class SelectionList:
     def __iadd__(self, selection):
         assert isinstance(selection, Selection)
         self.__selections.append(selection)
+        sub_selection_list = selection.__selection_list__
+        if sub_selection_list is not None:
+            sub_selection_list.__parent = self
+            sub_selection_list.__root_schema = None
+        self.__changed(True)
         return self
 
 
@@ -495,6 +884,12 @@ class Operation:
       parent = op + json_data
       print(parent.field.child)
 
+    The ``bytes()`` are minified, see :func:`minify()`, with repeated
+    selections extracted as named fragments. The rendered
+    text (``str()``, ``repr()`` and ``bytes()``) is cached per
+    indentation, until selections are added or changed
+    anywhere in the operation, thus sending the same operation many
+    times only renders it once.
     '''
     def __init__(self, typ=None, name=None, **args):
         if typ is None:
@@ -512,21 +907,125 @@ class Operation:
         self.__args = ArgDict(variable_args)
         self.__args._set_container(typ.__schema__, self)
         self.__selection_list = SelectionList(typ)
-
-    def __to_graphql__(self, indent=0, indent_string='  '):
-        prefix = indent_string * indent
-        kind = 'query'
+        self.__rendered = {}  # (indent, indent_string) or bytes -> text
+        self.__rendered_generation = 0
+
+    def __cached(self, key, render):
+        generation = self.__selection_list.__generation__
+        if self.__rendered_generation != generation:
+            self.__rendered = {}
+            self.__rendered_generation = generation
+        try:
+            return self.__rendered[key]
+        except KeyError:
+            pass
+        text = self.__rendered[key] = render()
+        return text
+
+    def __to_graphql__(self, indent=0, indent_string='  ',
+                       auto_fragments=False):
+        '''The GraphQL text of the operation.
+
+        With ``auto_fragments=True``, selections of the same type and
+        fields repeated in many places are written once as named
+        fragments (``TypeFields``, ``TypeFields2``...), replaced by
+        their spreads. These are only extracted if the text is
+        shorter, this is what ``bytes()`` does:
+
+        >>> from sgqlc.types import Schema, Type, Field, list_of
+        >>> schema = Schema()
+        >>> class Label(Type):
+        ...     __schema__ = schema
+        ...     name = str
+        ...     color = str
+        ...     description = str
+        >>> class Issue(Type):
+        ...     __schema__ = schema
+        ...     title = str
+        ...     labels = list_of(Label)
+        >>> class Query(Type):
+        ...     __schema__ = schema
+        ...     issue = Field(Issue, args={'number': int})
+        >>> op = Operation(Query)
+        >>> for number in (1, 2, 3):
+        ...     op.issue(number=number, __alias__='i%d' % number).__fields__()
+        >>> print(op.__to_graphql__(auto_fragments=True))
+        query {
+          i1: issue(number: 1) {
+            ...IssueFields
+          }
+          i2: issue(number: 2) {
+            ...IssueFields
+          }
+          i3: issue(number: 3) {
+            ...IssueFields
+          }
+        }
+        <BLANKLINE>
+        fragment IssueFields on Issue {
+          labels {
+            color
+            description
+            name
+          }
+          title
+        }
+        >>> print(bytes(op).decode('utf-8'))
+        query{i1:issue(number:1){...IssueFields}i2:issue(number:2)\
+{...IssueFields}i3:issue(number:3){...IssueFields}}fragment IssueFields\
+ on Issue{labels{color description name}title}
+        '''
+        return self.__cached(
+            (indent, indent_string, auto_fragments),
+            lambda: self.__render(indent, indent_string, auto_fragments))
+
+    def __render(self, indent, indent_string, auto_fragments):
+        chunks = []
+        self.__write_graphql__(chunks.append, indent, indent_string,
+                               auto_fragments)
+        return ''.join(chunks)
+
+    def __write_graphql__(self, write, indent=0, indent_string='  ',
+                          auto_fragments=False):
+        '''Render by calling ``write()`` with each chunk of text.
+
+        This is not cached, it may be used to send large operations
+        in chunks. See
+        :func:`sgqlc.operation.Selection.__write_graphql__()` and
+        :func:`sgqlc.operation.Operation.__to_graphql__()`.
+        '''
+        fragments = None
+        if auto_fragments:
+            fragments = _Fragments(self.__selection_list)
+        write(indent_string * indent)
         if self.__type.__name__ == 'Mutation':
-            kind = 'mutation'
-
-        name = ''
+            write('mutation')
+        else:
+            write('query')
         if self.__name:
-            name = ' ' + self.__name
-
-        args = self.__args.__to_graphql__(indent, indent_string)
-        selections = self.__selection_list.__to_graphql__(
-            indent, indent_string)
-        return prefix + kind + name + args + ' ' + selections
+            write(' ')
+            write(self.__name)
+        write(self.__args.__to_graphql__(indent, indent_string))
+        write(' ')
+        self.__selection_list.__write_graphql__(write, indent, indent_string,
+                                                fragments)
+        if fragments is not None:
+            fragments.write_definitions(write, indent, indent_string)
+
+    @property
+    def __operation_name__(self):
+        '''The operation name, or ``None``.'''
+        return self.__name
+
+    @property
+    def __variables__(self):
+        '''The :class:`sgqlc.types.ArgDict` of declared variables.
+
+        Keys are the Python names prefixed with ``$``, such as
+        ``'$repo_name'``, while the GraphQL names of the arguments are
+        the ones sent, such as ``'$repoName'``.
+        '''
+        return self.__args
 
     def __iter__(self):
         return iter(self.__selection_list)
@@ -550,7 +1049,300 @@ class Operation:
         return self.__to_graphql__()
 
     def __bytes__(self):
-        return bytes(self.__to_graphql__(indent_string=''), 'utf-8')
+        return self.__cached(bytes, lambda: bytes(minify(
+            self.__to_graphql__(indent_string='', auto_fragments=True)),
+            'utf-8'))
 
     def __add__(self, other):
         return self.__type(other.get('data'), self.__selection_list)
+
+    def __compile_decoders__(self):
+        '''Compute the decoders of the whole selection tree at once.
+
+        Otherwise these are computed as each type and selection is
+        first decoded, see
+        :func:`sgqlc.types.ContainerTypeMeta.__decoder__()`. Concrete
+        types of interfaces and unions are only compiled if selected
+        with ``__as__()``.
+        '''
+        _compile_decoders(self.__type, self.__selection_list)
+
+    def __resolve_path(self, path):
+        typ = self.__type
+        selection_list = self.__selection_list
+        json_keys = ['data']
+        for name in path.split('.'):
+            try:
+                step = typ.__decoder__(selection_list)[name]
+            except KeyError as exc:
+                raise KeyError('%s has no selection %s' % (typ, name)) from exc
+            json_key, _, _, typ, selection_list, _, _ = step
+            json_keys.append(json_key)
+        return typ, selection_list, json_keys
+
+    def __decode_path__(self, path):
+        '''Resolve the list at ``path`` to decode its elements one by one.
+
+        This allows streaming the elements of large lists, see
+        :func:`sgqlc.endpoint.http.HTTPEndpoint.stream()`.
+
+        :param path: dot separated field names or aliases, such as
+          ``'repository.issues.nodes'``.
+        :type path: str
+
+        :return: tuple with the JSON keys to reach the list, starting
+          at ``'data'``, and a function to convert each of its elements.
+        :rtype: tuple
+        '''
+        typ, selection_list, json_keys = self.__resolve_path(path)
+        while typ.__wrapper__ == 'non_null':
+            typ = typ.__of_type__
+        if typ.__wrapper__ != 'list_of':
+            raise ValueError('%s is not a list: %s' % (path, typ))
+        convert = typ.__of_type__.__converter__()
+
+        def decode(json_data):
+            return convert(json_data, selection_list)
+
+        return json_keys, decode
+
+    def __to_columns__(self, json_data, path, use_numpy=False):
+        '''Interpret a list in the resulting JSON data as columns.
+
+        Unlike ``__add__()``, no objects are created. The JSON list at
+        the given ``path`` (dot separated field names or aliases) is
+        converted using
+        :func:`sgqlc.types.ContainerTypeMeta.__to_columns__()`:
+
+        .. code-block:: python
+
+          op = Operation()
+          op.repository(owner='o', name='n').issues.nodes.number()
+
+          json_data = endpoint(op)
+          columns = op.__to_columns__(json_data, 'repository.issues.nodes')
+          print(sum(columns.number))
+
+        :return: mapping of field name (or alias) to its column, or
+          ``None`` if any element of the path is ``null``.
+        '''
+        typ, selection_list, json_keys = self.__resolve_path(path)
+        for k in json_keys:
+            if json_data is None:
+                return None
+            json_data = json_data.get(k)
+        return typ.__to_columns__(json_data, selection_list, use_numpy)
+
+
+def _compile_decoders(typ, selection_list):
+    # computes the decoder steps of the whole selection tree, they are
+    # cached in the selection lists, see ContainerTypeMeta.__decoder__()
+    if issubclass(typ, ContainerType):
+        for step in typ.__decoder__(selection_list).values():
+            sub_type, sub_selection_list = step[3], step[4]
+            if sub_selection_list is not None:
+                while sub_type.__wrapper__ is not None:
+                    sub_type = sub_type.__of_type__
+                _compile_decoders(sub_type, sub_selection_list)
+    if typ.__kind__ == 'type':
+        return  # casts are only decoded as concrete types
+    for cast_type, _ in selection_list.__casts__.values():
+        if cast_type.__kind__ == 'type':
+            _compile_decoders(cast_type, selection_list)
+
+
+class PreparedOperation:
+    '''Operation rendered once, to be executed many times.
+
+    The query text and operation name are rendered and JSON encoded
+    when created, as well as the decoders of the results, thus each
+    execution only encodes its variables. These are validated using
+    the types declared by the operation, see :class:`Operation`:
+
+    .. code-block:: python
+
+      op = Operation(Query, owner=non_null(str), repo=non_null(str))
+      repo = op.repository(owner=Variable('owner'), name=Variable('repo'))
+      repo.issues.total_count()
+
+      prepared = PreparedOperation(op)
+      for name in ('a', 'b'):
+          json_data = endpoint(prepared, {'owner': 'o', 'repo': name})
+          print((prepared + json_data).repository.issues.total_count)
+
+    Endpoints use :func:`PreparedOperation.__request_body__()` to get
+    the request body, other uses get the minified query text with
+    ``str()`` or ``bytes()``. With ``short_variables=True`` the
+    variables are also renamed to short names in the query text (see
+    :func:`minify()`), while they are still given with their
+    original names.
+
+    .. note::
+
+      The operation must not be changed afterwards, changes are not
+      reflected in the prepared operation.
+    '''
+
+    __slots__ = ('__operation', 'query', 'name', '__variables',
+                 '__body_prefix')
+
+    def __init__(self, operation, short_variables=False):
+        '''
+        :param operation: the operation to prepare.
+        :type operation: :class:`sgqlc.operation.Operation`
+
+        :param short_variables: whether to rename variables to short
+          generated names in the query text.
+        :type short_variables: bool
+        '''
+        self.__operation = operation
+        if short_variables:
+            renamed = {}
+            self.query = minify(operation.__to_graphql__(
+                indent_string='', auto_fragments=True), renamed)
+        else:
+            renamed = None
+            self.query = bytes(operation).decode('utf-8')
+        self.name = operation.__operation_name__
+
+        # (name, graphql name, to_json_value, convert, pass_thru, required)
+        variables = []
+        for arg in operation.__variables__.values():
+            typ = arg.type
+            graphql_name = arg.graphql_name[1:]
+            if renamed is not None:
+                graphql_name = renamed.get(graphql_name, graphql_name)
+            variables.append((
+                arg.name[1:],
+                graphql_name,
+                typ.__json_encoder__(),
+                typ.__converter__(),
+                typ.__pass_thru__(),
+                typ.__wrapper__ == 'non_null' and arg.default is None,
+            ))
+        self.__variables = tuple(variables)
+
+        body = json.dumps({'query': self.query, 'operationName': self.name},
+                          separators=(',', ':'))
+        self.__body_prefix = (body[:-1] + ',"variables":').encode('utf-8')
+        operation.__compile_decoders__()
+
+    def encode_variables(self, variables=None):
+        '''Validate and convert variables to JSON values.
+
+        :param variables: mapping of variable name, as given to
+          :class:`Operation` (without ``$``), to its value.
+        :type variables: dict
+
+        :return: mapping of GraphQL variable name to its JSON value.
+        :rtype: dict
+
+        :raise ValueError: for unknown variables, missing ``non_null()``
+          variables without defaults or values rejected by their types.
+
+        Values are sent as converted by their types, while scalars
+        that are decoded as is (see
+        :func:`sgqlc.types.Scalar.__pass_thru__()`) must not change:
+
+        >>> from sgqlc.types import Schema, Type, Input, Field, Int, \\
+        ...     Float, Variable, non_null, list_of
+        >>> schema = Schema()
+        >>> class IssueFilter(Input):
+        ...     __schema__ = schema
+        ...     state = str
+        ...     labels = list_of(str)
+        >>> class Issue(Type):
+        ...     __schema__ = schema
+        ...     number = int
+        >>> class Query(Type):
+        ...     __schema__ = schema
+        ...     issues = Field(list_of(Issue), args={
+        ...         'filter': IssueFilter, 'first': int})
+        >>> op = Operation(Query, filter=IssueFilter, first=non_null(Int),
+        ...                score=Float)
+        >>> op.issues(filter=Variable('filter'),
+        ...           first=Variable('first')).__fields__()
+        >>> prepared = PreparedOperation(op)
+        >>> encoded = prepared.encode_variables({
+        ...     'filter': {'state': 'OPEN', 'labels': ['bug']},
+        ...     'first': 10, 'score': 1})
+        >>> encoded == {'filter': {'state': 'OPEN', 'labels': ['bug']},
+        ...             'first': 10, 'score': 1.0}
+        True
+        >>> prepared.encode_variables({'first': '1'})
+        Traceback (most recent call last):
+          ...
+        ValueError: Query: variable first: '1' (not a int)
+        >>> prepared.encode_variables({'first': 1.9})
+        Traceback (most recent call last):
+          ...
+        ValueError: Query: variable first: 1.9 (not a int)
+        >>> prepared.encode_variables({'first': True})
+        Traceback (most recent call last):
+          ...
+        ValueError: Query: variable first: True (not a int)
+        >>> prepared.encode_variables({'first': 1, 'score': False})
+        Traceback (most recent call last):
+          ...
+        ValueError: Query: variable score: False (not a float)
+        '''
+        variables = dict(variables) if variables else {}
+        encoded = {}
+        for name, graphql_name, to_json_value, convert, pass_thru, \
+                required in self.__variables:
+            try:
+                value = variables.pop(name)
+            except KeyError:
+                if required:
+                    raise ValueError('%s: missing variable %s' % (
+                        self.name, name)) from None
+                continue
+            value = to_json_value(value)
+            if value.__class__ is not pass_thru:
+                try:
+                    converted = convert(value)
+                    # bool is an int subclass, True == 1
+                    if pass_thru is not None and (
+                            converted != value or value.__class__ is bool):
+                        raise TypeError('not a %s' % pass_thru.__name__)
+                except Exception as exc:
+                    raise ValueError('%s: variable %s: %r (%s)' % (
+                        self.name, name, value, exc)) from exc
+                value = to_json_value(converted)
+            encoded[graphql_name] = value
+        if variables:
+            raise ValueError('%s: unknown variables %s' % (
+                self.name, ', '.join(sorted(variables))))
+        return encoded
+
+    def __request_body__(self, variables=None):
+        '''The JSON request body to execute with ``variables``.
+
+        Only the variables are encoded, see
+        :func:`PreparedOperation.encode_variables()`.
+
+        :rtype: bytes
+        '''
+        encoded = json.dumps(self.encode_variables(variables),
+                             separators=(',', ':'))
+        return b''.join((self.__body_prefix, encoded.encode('utf-8'), b'}'))
+
+    def __decode_path__(self, path):
+        '''Same as :func:`Operation.__decode_path__()`.'''
+        return self.__operation.__decode_path__(path)
+
+    def __to_columns__(self, json_data, path, use_numpy=False):
+        '''Same as :func:`Operation.__to_columns__()`.'''
+        return self.__operation.__to_columns__(json_data, path, use_numpy)
+
+    def __add__(self, other):
+        return self.__operation + other
+
+    def __str__(self):
+        return self.query
+
+    def __repr__(self):
+        return '%s(%s)' % (self.__class__.__name__, self.__operation)
+
+    def __bytes__(self):
+        return self.query.encode('utf-8')
@@ -80,6 +80,9 @@ The end-user classes and functions provided by this module are:
  - :func:`list_of()`, maps to GraphQL ``[Type]`` and enforces the
    object is a list of ``Type``.
 
+ - :func:`interned()`, decodes string values with :func:`sys.intern`,
+   so repeated values share the same object.
+
 This module only provide built-in scalar types. However, two other
 modules will extend the behavior for common conventions:
 
@@ -100,13 +103,17 @@ modules will extend the behavior for common conventions:
 
 __docformat__ = 'reStructuredText en'
 
+import array
+import enum
 import json
+import sys
+import weakref
 from collections import OrderedDict
 
 __all__ = (
     'Schema', 'Scalar', 'Enum', 'Union', 'Variable', 'Arg', 'ArgDict',
     'Field', 'Type', 'Interface', 'Input', 'Int', 'Float', 'String',
-    'Boolean', 'ID', 'non_null', 'list_of',
+    'Boolean', 'ID', 'non_null', 'list_of', 'interned',
 )
 
 
@@ -133,22 +140,48 @@ class Schema:
     New schema will inherit the types defined at ``base_schema``,
     which defaults to ``global_schema``, at the time of their
     creation. However types added to ``base_schema`` after the schema
-    creation are not automatically picked by existing schema. The copy
-    happens at construction time.
+    creation are not automatically picked by existing schema.
+
+    The new schema does not copy the types, it's layered on top of
+    ``base_schema``, looking up missing types there and only keeping
+    its own additions and removals. Before ``base_schema`` is
+    changed, the schemas layered on top of it copy its types (copy on
+    write), so creating a schema is cheap while its contents remain
+    the same.
 
     New types may be added to schema using ``schema += type`` and
     removed with ``schema -= type``. However those will not affect
     their member ``type.__schema__``, which remains the same (where they
-    where originally created).
+    where originally created). Removals increment
+    ``__generation__``, invalidating types resolved from their names,
+    see :class:`Field`.
 
     The schema is an iterator that will report all registered types.
+
+    If ``intern=True``, fields of containers declared in this schema
+    will decode strings using :func:`interned()` types, unless the
+    field says otherwise, see :class:`Field`.
+
+    If ``deferred=True``, containers declared in this schema will only
+    create their fields on first use, such as accessing their
+    attributes, iterating them, using them in an
+    :class:`sgqlc.operation.Operation` or decoding JSON. This makes
+    declaring huge schemas much faster when only some types are used.
     '''
-    __slots__ = ('__all', '__kinds', '__cache__')
+    __slots__ = ('__all', '__kinds', '__base', '__removed', '__children',
+                 '__cache__', '__generation__', '__intern__', '__deferred__',
+                 '__weakref__')
 
-    def __init__(self, base_schema=None):
-        self.__all = OrderedDict()
+    def __init__(self, base_schema=None, intern=False, deferred=False):
+        self.__all = OrderedDict()  # own types, added to this schema
         self.__kinds = {}
+        self.__base = None
+        self.__removed = set()  # names of base types removed from this
+        self.__children = weakref.WeakSet()  # layered on top of this
         self.__cache__ = {}
+        self.__generation__ = 0
+        self.__intern__ = intern
+        self.__deferred__ = deferred
 
         if base_schema is None:
             try:
@@ -159,28 +192,85 @@ class Schema:
                 pass
 
         if base_schema is not None:
-            self.__all.update(base_schema.__all)
-            for k, v in base_schema.__kinds.items():
-                self.__kinds.setdefault(k, ODict()).update(v)
+            self.__base = base_schema
+            base_schema.__children.add(self)
+
+    def __lookup(self, key):
+        schema = self
+        while schema is not None:
+            typ = schema.__all.get(key)
+            if typ is not None or key in schema.__removed:
+                return typ
+            schema = schema.__base
+        return None
+
+    def __types(self):
+        if self.__base is None:
+            return self.__all
+        types = OrderedDict(
+            (k, v) for k, v in self.__base.__types().items()
+            if k not in self.__removed)
+        types.update(self.__all)
+        return types
+
+    def __kind_keys(self):
+        keys = set(self.__kinds.keys())
+        if self.__base is not None:
+            keys.update(self.__base.__kind_keys())
+        return keys
+
+    def __kind_types(self, kind):
+        if self.__base is None:
+            return self.__kinds.get(kind)
+        types = self.__base.__kind_types(kind)
+        if types is not None:
+            types = ODict((k, v) for k, v in types.items()
+                          if k not in self.__removed)
+        own = self.__kinds.get(kind)
+        if own is not None:
+            if types is None:
+                types = ODict()
+            for k, v in own.items():
+                types.pop(k, None)
+                types[k] = v
+        return types
+
+    def __detach(self):
+        # copy base types before it changes, see __before_change()
+        kinds = {}
+        for k in self.__kind_keys():
+            kinds[k] = ODict(self.__kind_types(k))
+        self.__all = OrderedDict(self.__types())
+        self.__kinds = kinds
+        self.__removed = set()
+        self.__base.__children.discard(self)
+        self.__base = None
+
+    def __before_change(self):
+        if self.__children:
+            for child in list(self.__children):
+                child.__detach()
 
     def __contains__(self, key):
-        return key in self.__all
+        return self.__lookup(key) is not None
 
     def __getitem__(self, key):
-        return self.__all[key]
+        typ = self.__lookup(key)
+        if typ is None:
+            raise KeyError(key)
+        return typ
 
     def __getattr__(self, key):
-        try:
-            return self.__kinds[key]  # .type, .scalar, etc...
-        except KeyError:
-            pass
-        try:
-            return self.__all[key]
-        except KeyError as exc:
-            raise AttributeError(key) from exc
+        types = self.__kind_types(key)  # .type, .scalar, etc...
+        if types is not None:
+            return types
+        typ = self.__lookup(key)
+        if typ is None:
+            raise AttributeError(key)
+        return typ
 
     def __iter__(self):
-        return iter(self.__all.values())
+        return iter(self.__types().values())
 
     def __iadd__(self, typ):
         '''Manually add a type to the schema.
@@ -194,10 +284,14 @@ class Schema:
         To remove a type, use ``schema -= typ``.
         '''
         name = typ.__name__
-        t = self.__all.setdefault(name, typ)
-        if t is not typ:
-            raise ValueError('%s already has %s=%s' %
-                             (self.__class__.__name__, name, typ))
+        t = self.__lookup(name)
+        if t is not None:
+            if t is not typ:
+                raise ValueError('%s already has %s=%s' %
+                                 (self.__class__.__name__, name, typ))
+            return self
+        self.__before_change()
+        self.__all[name] = typ
         self.__kinds.setdefault(typ.__kind__, ODict()).update({name: typ})
         return self
 
@@ -209,8 +303,15 @@ class Schema:
         :class:`sgqlc.types.datetime.DateTime`.
         '''
         name = typ.__name__
-        del self.__all[name]
-        del self.__kinds[typ.__kind__][name]
+        if self.__lookup(name) is None:
+            raise KeyError(name)
+        self.__before_change()
+        self.__generation__ += 1
+        if name in self.__all:
+            del self.__all[name]
+            del self.__kinds[typ.__kind__][name]
+        if self.__base is not None and name in self.__base:
+            self.__removed.add(name)
         return self
 
     def __str__(self):
@@ -259,6 +360,51 @@ class BaseMeta(type):
     def __bytes__(cls):
         return bytes(cls.__to_graphql__(indent_string=''), 'utf-8')
 
+    def __pass_thru__(cls):
+        '''Python type of JSON values that are decoded as is.
+
+        Values of exactly this type do not need to be converted,
+        decoders skip calling the type for them. By default this is
+        ``None``, every value is converted, see
+        :func:`Scalar.__pass_thru__()`.
+        '''
+        return None
+
+    def __converter__(cls, frozen=False):
+        '''Function converting JSON values, same as calling the type.
+
+        Its signature is ``(json_data, selection_list=None)``. By
+        default this is the type itself, while :func:`non_null()` and
+        :func:`list_of()` compute a single function for the whole
+        chain of wrappers (ie: ``non_null(list_of(non_null(Label)))``)
+        instead of creating an intermediate class per level, used by
+        decoders.
+
+        If ``frozen``, lists are converted to tuples, used by frozen
+        containers (see :class:`ContainerType`).
+        '''
+        return cls
+
+    def __json_encoder__(cls):
+        '''Function converting values to JSON, given one value.
+
+        By default this is ``__to_json_value__()``, while
+        :class:`ContainerType` gives the class level encoder, since
+        ``__to_json_value__()`` of its instances take no arguments.
+        :func:`list_of()` encodes each element with the encoder of the
+        wrapped type.
+        '''
+        return cls.__to_json_value__
+
+    def __to_column__(cls, values, selection_list=None, use_numpy=False):
+        '''Convert a list of JSON values into a column.
+
+        By default this is a list of converted values, subclasses may
+        provide more efficient sequences, see
+        :func:`ContainerTypeMeta.__to_columns__()`.
+        '''
+        return [cls(v, selection_list) for v in values]
+
     def __ensure__(cls, t):
         if isinstance(t, type) and issubclass(t, cls):
             return t
@@ -271,9 +417,40 @@ class BaseMeta(type):
 class BaseType(metaclass=BaseMeta):
     '''Base shared by all GraphQL classes.
 
+    Types created by :func:`non_null()` and :func:`list_of()` have
+    ``__wrapper__`` set to ``'non_null'`` or ``'list_of'`` and
+    ``__of_type__`` set to the wrapped type, these are ``None`` for
+    other types.
     '''
+    __slots__ = ()
     __schema__ = global_schema
     __kind__ = None
+    __wrapper__ = None
+    __of_type__ = None
+    __store_raw__ = False
+    __intern__ = False
+
+
+def _cached_wrapper(t, name):
+    # wrappers are cached by name in the schema of the wrapped type,
+    # only reused if they wrap this very type: once removed from the
+    # schema, a type may be declared again with the same name
+    wrapper = t.__schema__.__cache__.get(name)
+    if wrapper is not None and wrapper.__bases__[0] is t:
+        return wrapper
+    return None
+
+
+def _non_null_converter(t, frozen):
+    convert_of = t.__converter__(frozen)
+    error = t.__name__ + '! received null value'
+
+    def convert(json_data, selection_list=None):
+        if json_data is None:
+            raise ValueError(error)
+        return convert_of(json_data, selection_list)
+
+    return convert
 
 
 def non_null(t):
@@ -281,15 +458,20 @@ def non_null(t):
     '''
     t = BaseType.__ensure__(t)
     name = t.__name__ + '!'
-    try:
-        return t.__schema__.__cache__[name]
-    except KeyError:
-        pass
+    wrapper = _cached_wrapper(t, name)
+    if wrapper is not None:
+        return wrapper
+
+    convert = _non_null_converter(t, False)
+    frozen_convert = convert
+    if t.__wrapper__ == 'list_of':
+        frozen_convert = _non_null_converter(t, True)
 
     def __new__(cls, json_data, selection_list=None):
-        if json_data is None:
-            raise ValueError(name + ' received null value')
-        return t(json_data)
+        return convert(json_data, selection_list)
+
+    def __converter__(frozen=False):
+        return frozen_convert if frozen else convert
 
     def __to_graphql_input__(value, indent=0, indent_string='  '):
         return t.__to_graphql_input__(value, indent, indent_string)
@@ -297,27 +479,45 @@ def non_null(t):
     wrapper = type(name, (t,), {
         '__new__': __new__,
         '_%s__auto_register' % name: False,
+        '__wrapper__': 'non_null',
+        '__of_type__': t,
+        '__converter__': __converter__,
         '__to_graphql_input__': __to_graphql_input__,
     })
     t.__schema__.__cache__[name] = wrapper
     return wrapper
 
 
-def list_of(t):
-    '''Generates list of types ([t])
-    '''
-    t = BaseType.__ensure__(t)
-    name = '[' + t.__name__ + ']'
-    try:
-        return t.__schema__.__cache__[name]
-    except KeyError:
-        pass
+def _list_converter(t, frozen):
+    # flattened: elements of non_null() are checked for null at once,
+    # then converted by the wrapped type, unless passed thru
+    element, null_error = t, None
+    if t.__wrapper__ == 'non_null':
+        element = t.__of_type__
+        null_error = t.__name__ + ' received null value'
+    convert_element = element.__converter__(frozen)
+    pass_thru = element.__pass_thru__()
 
-    def __new__(cls, json_data, selection_list=None):
+    def convert(json_data, selection_list=None):
         if json_data is None:
             return None
-        return [t(v, selection_list) for v in json_data]
+        if null_error and None in json_data:
+            raise ValueError(null_error)
+        return [v if v.__class__ is pass_thru
+                else convert_element(v, selection_list)
+                for v in json_data]
+
+    if not frozen:
+        return convert
+
+    def convert_frozen(json_data, selection_list=None):
+        value = convert(json_data, selection_list)
+        return value if value is None else tuple(value)
+
+    return convert_frozen
 
+
+def _list_to_graphql_input(t):
     def __to_graphql_input__(value, indent=0, indent_string='  '):
         if value is None:
             return None
@@ -326,16 +526,102 @@ def list_of(t):
             r.append(t.__to_graphql_input__(v, indent, indent_string))
         return '[' + ', '.join(r) + ']'
 
+    return __to_graphql_input__
+
+
+def _list_to_json_value(t):
     def __to_json_value__(value):
         if value is None:
             return None
-        return [t.__to_json_value__(v) for v in value]
+        to_json_value = t.__json_encoder__()
+        return [to_json_value(v) for v in value]
+
+    return __to_json_value__
+
+
+def list_of(t):
+    '''Generates list of types ([t])
+    '''
+    t = BaseType.__ensure__(t)
+    name = '[' + t.__name__ + ']'
+    wrapper = _cached_wrapper(t, name)
+    if wrapper is not None:
+        return wrapper
+
+    convert = _list_converter(t, False)
+    frozen_convert = _list_converter(t, True)
+    to_json_value = _list_to_json_value(t)
+
+    def __new__(cls, json_data, selection_list=None):
+        return convert(json_data, selection_list)
+
+    def __converter__(frozen=False):
+        return frozen_convert if frozen else convert
+
+    def __json_encoder__():
+        return to_json_value
+
+    def __to_column__(values, selection_list=None, use_numpy=False):
+        return [convert(v, selection_list) for v in values]
 
     wrapper = type(name, (t,), {
         '__new__': __new__,
         '_%s__auto_register' % name: False,
-        '__to_graphql_input__': __to_graphql_input__,
-        '__to_json_value__': __to_json_value__,
+        '__wrapper__': 'list_of',
+        '__of_type__': t,
+        '__converter__': __converter__,
+        '__to_graphql_input__': _list_to_graphql_input(t),
+        '__to_json_value__': to_json_value,
+        '__json_encoder__': __json_encoder__,
+        '__to_column__': __to_column__,
+    })
+    t.__schema__.__cache__[name] = wrapper
+    return wrapper
+
+
+def interned(t):
+    '''Generates a type that interns decoded strings.
+
+    Repeated values, such as enumerations, IDs or names, will share the
+    same string object, see :func:`sys.intern`. This is only useful for
+    :class:`Scalar` producing ``str``, other types are returned as is
+    (:class:`Enum` always decode to their interned choices), while
+    :func:`non_null()` and :func:`list_of()` are rebuilt on top of the
+    interned type.
+
+    Note that containers keeping the JSON backing store also keep the
+    original strings, memory is only saved if these are released, see
+    ``__slotted__`` and ``__single_copy__`` in :class:`ContainerType`.
+
+    It is usually not needed to call this directly, declare the field
+    with ``Field(typ, intern=True)``, the schema with
+    ``Schema(intern=True)`` or set ``__intern__ = True`` in the type.
+
+    >>> t = interned(list_of(non_null(String)))
+    >>> print(t)
+    [interned(String)!]
+    >>> t is interned(t)
+    True
+    >>> a, b = t([''.join(['Wo', 'rd']), ''.join(['W', 'ord'])])
+    >>> a is b
+    True
+    '''
+    t = BaseType.__ensure__(t)
+    if t.__wrapper__ == 'non_null':
+        return non_null(interned(t.__of_type__))
+    elif t.__wrapper__ == 'list_of':
+        return list_of(interned(t.__of_type__))
+    elif t.__intern__ or not issubclass(t, Scalar):
+        return t
+
+    name = 'interned(' + t.__name__ + ')'
+    wrapper = _cached_wrapper(t, name)
+    if wrapper is not None:
+        return wrapper
+
+    wrapper = type(name, (t,), {
+        '_%s__auto_register' % name: False,
+        '__intern__': True,
     })
     t.__schema__.__cache__[name] = wrapper
     return wrapper
@@ -350,23 +636,95 @@ class Scalar(BaseType):
 
     Scalar classes will never produce instance of themselves, rather
     return the converted value (int, bool...)
+
+    Scalars with ``__column_typecode__`` (an :mod:`array` type code)
+    are converted to columns as :class:`array.array`, or
+    :mod:`numpy` arrays using ``__column_dtype__`` if requested and
+    available. See :func:`ContainerTypeMeta.__to_columns__()`.
+
+    Scalars with ``__store_raw__ = True`` are kept as JSON values by
+    containers using ``__single_copy__`` and converted on every
+    access. This is useful if the converted value is much bigger than
+    the JSON value, otherwise it's better to keep the converted value.
+
+    Scalars with ``__intern__ = True`` will pass converted ``str``
+    values to :func:`sys.intern`, see :func:`interned()`.
+
+    Scalars converting with ``str``, ``int``, ``float`` or ``bool``
+    keep JSON values that already have such type without calling the
+    converter, see :func:`Scalar.__pass_thru__()`.
     '''
     __kind__ = 'scalar'
+    __column_typecode__ = None
+    __column_dtype__ = None
 
     def converter(value):
         return value
 
     def __new__(cls, json_data, selection_list=None):
-        return None if json_data is None else cls.converter(json_data)
+        if json_data is None:
+            return None
+        value = cls.converter(json_data)
+        if cls.__intern__ and value.__class__ is str:
+            return sys.intern(value)
+        return value
 
     @classmethod
     def __to_graphql_input__(cls, value, indent=0, indent_string='  '):
         return json.dumps(cls.__to_json_value__(value))
 
+    @classmethod
+    def __pass_thru__(cls):
+        '''Python type of JSON values that are decoded as is.
+
+        This is the ``converter`` if it's one of ``str``, ``int``,
+        ``float`` or ``bool`` and the type does not customize
+        ``__new__()`` or use ``__intern__``, otherwise ``None``.
+        :func:`non_null()` of such types also pass thru, since
+        ``null`` is not of the returned type.
+
+        >>> non_null(String).__pass_thru__()
+        <class 'str'>
+        >>> list_of(Int).__pass_thru__() is None
+        True
+        '''
+        if cls.__wrapper__ == 'non_null':
+            cls = cls.__of_type__
+        if cls.__wrapper__ is not None or cls.__intern__ or \
+                cls.__new__ is not Scalar.__new__:
+            return None
+        converter = cls.converter
+        if converter in (str, int, float, bool):
+            return converter
+        return None
+
     @classmethod
     def __to_json_value__(cls, value):
         return value
 
+    @classmethod
+    def __to_column__(cls, values, selection_list=None, use_numpy=False):
+        typecode = cls.__column_typecode__
+        if typecode is None:
+            return [cls(v) for v in values]
+
+        try:
+            column = array.array(typecode, values)
+        except (TypeError, OverflowError):
+            values = [cls(v) for v in values]
+            try:
+                column = array.array(typecode, values)
+            except (TypeError, OverflowError):
+                return values  # nulls or out of range, keep as list
+
+        if use_numpy:
+            try:
+                import numpy
+            except ImportError:
+                return column
+            return numpy.frombuffer(column, dtype=cls.__column_dtype__)
+        return column
+
 
 class EnumMeta(BaseMeta):
     'meta class to set enumeration attributes, __contains__, __iter__...'
@@ -376,15 +734,48 @@ class EnumMeta(BaseMeta):
             raise ValueError(name + ': missing __choices__')
 
         if isinstance(cls.__choices__, str):
-            cls.__choices__ = tuple(cls.__choices__.split())
-        else:
-            cls.__choices__ = tuple(cls.__choices__)
-
-        for v in cls.__choices__:
-            setattr(cls, v, v)
+            cls.__choices__ = cls.__choices__.split()
+        cls.__choices__ = tuple(sys.intern(v) for v in cls.__choices__)
+
+        # maps choices, as well as the values they decode to, to the
+        # decoded values: checked and converted with a single lookup
+        values = cls.__python_values(name)
+        cls.__values = dict(zip(cls.__choices__, values))
+        cls.__values.update(zip(values, values))
+
+        for k, v in zip(cls.__choices__, values):
+            setattr(cls, k, v)
+
+    def __python_values(cls, name):
+        python_enum = cls.__python_enum__
+        if not python_enum:
+            return cls.__choices__
+        if python_enum is True:
+            python_enum = enum.Enum(
+                name, [(v, v) for v in cls.__choices__],
+                module=cls.__module__, qualname=cls.__qualname__)
+        try:
+            return tuple(python_enum[v] for v in cls.__choices__)
+        except KeyError as exc:
+            raise ValueError('%s: __python_enum__ %s is missing %s' % (
+                name, python_enum, exc)) from exc
 
     def __contains__(cls, v):
-        return v in cls.__choices__
+        try:
+            return v in cls.__values
+        except TypeError:  # unhashable
+            return False
+
+    def __decode__(cls, v):
+        '''The value decoded from JSON value ``v``, see :class:`Enum`.
+
+        :raise ValueError: if ``v`` is not a choice.
+        '''
+        try:
+            return cls.__values[v]
+        except (KeyError, TypeError):
+            raise ValueError('%s does not accept value %s' % (cls, v)) \
+                from None
 
     def __iter__(cls):
         return iter(cls.__choices__)
@@ -401,9 +792,13 @@ class EnumMeta(BaseMeta):
         return '\n'.join(s)
 
     def __to_graphql_input__(cls, value, indent=0, indent_string='  '):
+        if isinstance(value, enum.Enum):
+            return value.name
         return value
 
     def __to_json_value__(cls, value):
+        if isinstance(value, enum.Enum):
+            return value.name
         return value
 
 
@@ -417,27 +812,147 @@ class Enum(BaseType, metaclass=EnumMeta):
     Note that ``__choices__`` is not set in the final class, the
     metaclass will use that to build members and provide the
     ``__iter__``, ``__contains__`` and ``__len__`` instead.
+
+    Values are checked and decoded with a hash lookup, regardless of
+    the number of choices. These decode to the interned string, the
+    same object as the class member, unless ``__python_enum__`` is
+    set: then these decode to members of a Python :class:`enum.Enum`,
+    either given (members are looked up by name) or, if ``True``,
+    created with the same name, names and values as the choices.
+
+    >>> class Color(Enum):
+    ...     __choices__ = ('RED', 'GREEN')
+    ...     __python_enum__ = True
+    ...
+    >>> Color('RED')
+    <Color.RED: 'RED'>
+    >>> Color('RED') is Color.RED
+    True
+    >>> Color.__to_json_value__(Color.GREEN)
+    'GREEN'
+    >>> list(Color)
+    ['RED', 'GREEN']
     '''
     __kind__ = 'enum'
     __choices__ = ()
+    __python_enum__ = None
 
     def __new__(cls, json_data, selection_list=None):
         if json_data is None:
             return None
-        if json_data not in cls:
-            raise ValueError('%s does not accept value %s' % (cls, json_data))
-        return json_data
+        return cls.__decode__(json_data)
+
+
+def _possible_type(abstract, json_data, selection_list):
+    # types given to SelectionList.__as__() take precedence, otherwise
+    # names are looked up in the schema of the operation, the same
+    # name may be declared by more than one schema
+    typename = json_data.get('__typename')
+    schema = abstract.__schema__
+    if selection_list is not None:
+        cast = selection_list.__casts__.get(typename)
+        if cast is not None:
+            return cast[0]
+        schema = selection_list.__schema__
+    return abstract.__possible_type__(typename, schema)
+
+
+def _typed_json_value(value):
+    # objects of interfaces and unions are encoded as their concrete
+    # type, with __typename so they are decoded back as such
+    d = value.__to_json_value__()
+    d['__typename'] = value.__class__.__name__
+    return d
 
 
 class Union(BaseType):
     '''This is an abstract class that union of multiple types should
     inherit and define ``__types__``, a list of pre-defined
     :class:`Type`.
+
+    JSON objects are decoded as the type matching their
+    ``__typename``, which is automatically selected by
+    :class:`sgqlc.operation.Operation`, using
+    :func:`Union.__possible_types__()`. Objects of unknown types
+    raise :exc:`ValueError`.
+
+    Objects of unions and interfaces are encoded back to JSON as
+    their concrete type, including ``__typename``, so they are
+    decoded as the same type:
+
+    >>> schema = Schema()
+    >>> class Entity(Interface):
+    ...     __schema__ = schema
+    ...     id = ID
+    >>> class Issue(Type, Entity):
+    ...     __schema__ = schema
+    ...     number = int
+    >>> class PullRequest(Type, Entity):
+    ...     __schema__ = schema
+    ...     merged = bool
+    >>> class SearchResult(Union):
+    ...     __schema__ = schema
+    ...     __types__ = (Issue, PullRequest)
+    >>> class Query(Type):
+    ...     __schema__ = schema
+    ...     node = Entity
+    ...     search = list_of(SearchResult)
+    >>> json_data = {
+    ...     'node': {'__typename': 'Issue', 'id': '1', 'number': 2},
+    ...     'search': [{'__typename': 'PullRequest', 'id': '3',
+    ...                 'merged': True}],
+    ... }
+    >>> query = Query(json_data)
+    >>> query.node, query.search
+    (Issue(id='1', number=2), [PullRequest(id='3', merged=True)])
+    >>> query.__to_json_value__() == json_data
+    True
+    >>> query.node = query.search[0]
+    >>> query.__json_data__['node'] == json_data['search'][0]
+    True
     '''
 
     __kind__ = 'union'
     __types__ = ()
 
+    def __new__(cls, json_data, selection_list=None):
+        if json_data is None:
+            return None
+        typ = _possible_type(cls, json_data, selection_list)
+        if typ is None:
+            raise ValueError('%s has no type %r' % (
+                cls, json_data.get('__typename')))
+        return typ(json_data, selection_list)
+
+    @classmethod
+    def __possible_types__(cls):
+        '''Mapping of ``__typename`` to the type it's decoded as.
+
+        Computed once from ``__types__``.
+        '''
+        try:
+            return cls.__dict__['_Union__possible_types']
+        except KeyError:
+            pass
+        table = {t.__name__: t for t in cls.__types__}
+        cls.__possible_types = table
+        return table
+
+    @classmethod
+    def __possible_type__(cls, typename, schema=None):
+        '''Type to decode objects named ``typename``, or ``None``.
+
+        Union members are given by ``__types__``, regardless of the
+        ``schema``, see :func:`Union.__possible_types__()`.
+        '''
+        return cls.__possible_types__().get(typename)
+
+    @classmethod
+    def __to_json_value__(cls, value):
+        if value is None:
+            return None
+        return _typed_json_value(value)
+
     @classmethod
     def __iter__(cls):
         return iter(cls.__types__)
@@ -454,12 +969,46 @@ class Union(BaseType):
         return BaseMeta.__to_graphql__(cls, indent, indent_string) + suffix
 
 
+def _convert_field(obj, name, value, convert, selection_list):
+    # converts a field not passed thru, see ContainerTypeMeta.__decoder__()
+    try:
+        return convert(value, selection_list)
+    except Exception as exc:
+        raise ValueError('%s selection %r: %r (%s)' % (
+            obj.__class__, name, value, exc)) from exc
+
+
+# backing store of single copy containers with all fields converted
+_no_json_data = {}
+
+
+def _slotted_new(cls, json_data=None, selection_list=None):
+    # classes generated by ContainerTypeMeta.__slotted_class__()
+    return object.__new__(cls)
+
+
 class ContainerTypeMeta(BaseMeta):
     '''Creates container types, ensures fields are instance of Field.
     '''
+    def __new__(mcs, name, bases, namespace):
+        # slotted classes do not add a __dict__, so the subclasses
+        # generated by __slotted_class__() don't have one either,
+        # as long as all of their bases use __slots__
+        slotted = namespace.get('__slotted__', any(
+            getattr(b, '__slotted__', False) for b in bases))
+        if slotted and '__slots__' not in namespace:
+            namespace = dict(namespace, __slots__=())
+        return super(ContainerTypeMeta, mcs).__new__(
+            mcs, name, bases, namespace)
+
     def __init__(cls, name, bases, namespace):
         super(ContainerTypeMeta, cls).__init__(name, bases, namespace)
-        cls.__fields = OrderedDict()
+        cls.__fields = {}
+        cls.__pending = None
+        cls.__decoder = None
+        cls.__decoder_generation = None
+        cls.__slotted = None
+        cls.__possible_types = None
         cls.__interfaces__ = ()
 
         if not bases or BaseType in bases or ContainerType in bases:
@@ -469,8 +1018,35 @@ class ContainerTypeMeta(BaseMeta):
             cls.__fix_type_kind(bases)
 
         cls.__populate_interfaces(bases)
-        cls.__inherit_fields(bases)
-        cls.__create_own_fields()
+        if cls.__schema__.__deferred__:
+            cls.__defer_fields(namespace)
+            return
+
+        cls.__fields = cls.__build_fields(bases, namespace, False)
+
+    def __defer_fields(cls, namespace):
+        # keep public members aside, so accessing them reaches
+        # __getattr__() and builds the fields, see __get_fields().
+        # Snapshots give a mapping creating the fields on demand
+        # instead, see sgqlc.types.snapshot.loads()
+        cls.__fields = None
+        cls.__pending = namespace.get('__deferred_fields__')
+        if cls.__pending is not None:
+            return
+        cls.__pending = {}
+        for name, value in namespace.items():
+            if not name.startswith('_'):
+                cls.__pending[name] = value
+                delattr(cls, name)
+
+    def __get_fields(cls):
+        fields = cls.__fields
+        if fields is None:
+            pending = cls.__pending
+            cls.__pending = None
+            cls.__fields = fields = cls.__build_fields(
+                cls.__bases__, pending, True)
+        return fields
 
     def __fix_type_kind(cls, bases):
         for b in bases:
@@ -489,53 +1065,324 @@ class ContainerTypeMeta(BaseMeta):
 
         cls.__interfaces__ = tuple(ifaces)
 
-    def __inherit_fields(cls, bases):
-        for b in bases:
-            cls.__fields.update(b.__fields)
-
-    def __create_own_fields(cls):
-        for name in dir(cls):
+    def __possible_type__(cls, typename, schema=None):
+        '''Type to decode objects named ``typename``, or ``None``.
+
+        For interfaces this is the type of that name in ``schema``
+        (defaults to the schema of the interface), if it implements
+        the interface. Operations give their own schema, thus types
+        of the same name declared by other schemas are not used, see
+        :func:`ContainerTypeMeta.__converter__()`.
+
+        Found types are cached per schema, until types are removed
+        from it.
+
+        >>> from sgqlc.types.relay import Node
+        >>> schema_a, schema_b = Schema(), Schema()
+        >>> class Issue(Type, Node):
+        ...     __schema__ = schema_a
+        >>> IssueA = Issue
+        >>> class Issue(Type, Node):
+        ...     __schema__ = schema_b
+        >>> Node.__possible_type__('Issue', schema_a) is IssueA
+        True
+        >>> Node.__possible_type__('Issue', schema_b) is Issue
+        True
+        >>> print(Node.__possible_type__('Issue'))
+        None
+        '''
+        if schema is None:
+            schema = cls.__schema__
+        tables = cls.__possible_types
+        if tables is None:
+            tables = cls.__possible_types = weakref.WeakKeyDictionary()
+        generation, table = tables.get(schema, (None, None))
+        if generation != schema.__generation__:
+            table = {}
+            tables[schema] = (schema.__generation__, table)
+        typ = table.get(typename)
+        if typ is None and typename in schema:
+            typ = schema[typename]
+            if typ.__kind__ != 'type' or not issubclass(typ, cls):
+                return None
+            table[typename] = typ
+        return typ
+
+    def __converter__(cls, frozen=False):
+        '''Function converting JSON values, same as calling the type.
+
+        Interfaces decode JSON objects as the type given by their
+        ``__typename``, which is automatically selected by
+        :class:`sgqlc.operation.Operation`, or as the interface itself
+        if it's not known. See :func:`ContainerTypeMeta.__possible_type__()`.
+
+        ``frozen`` is ignored, objects are only frozen if their class
+        is, see :class:`ContainerType`.
+        '''
+        if cls.__kind__ != 'interface':
+            return cls
+
+        def convert(json_data, selection_list=None):
+            typ = None
+            if json_data is not None:
+                typ = _possible_type(cls, json_data, selection_list)
+            return (typ or cls)(json_data, selection_list)
+
+        return convert
+
+    def __build_fields(cls, bases, members, deferred):
+        # fields tables are never modified once built, so subclasses
+        # not declaring fields (ie: slotted or interned) share the
+        # table of their only base instead of copying it. These are
+        # plain dicts (ordered, about half the size of an OrderedDict)
+        own = cls.__create_own_fields(members, deferred)
+        inherited = [t for t in (b.__get_fields() for b in bases) if t]
+        if not own and len(inherited) == 1:
+            return inherited[0]
+
+        fields = {}
+        for t in inherited:
+            fields.update(t)
+        fields.update(own)
+        return fields
+
+    def __create_own_fields(cls, members, deferred):
+        # only the class namespace is scanned: fields of bases were
+        # already removed from them, see __build_fields(). Members
+        # are sorted to keep the order given by dir() in the past.
+        # Deferred members were removed from the class, those that are
+        # not fields are restored.
+        own = []
+        for name in sorted(members):
             if name.startswith('_'):
                 continue
 
-            field = getattr(cls, name)
+            value = members[name]
+            field = value
             if not isinstance(field, Field):
-                try:
-                    field = BaseType.__ensure__(field)
-                except TypeError as e:
+                field = cls.__field_type(value)
+                if field is None:
+                    if deferred:
+                        setattr(cls, name, value)
                     continue
-
                 field = Field(field)
 
             field._set_container(cls.__schema__, cls, name)
-            cls.__fields[name] = field
-            delattr(cls, name)  # let fallback to cls.__fields using getitem
+            own.append((name, field))
+            if not deferred:
+                delattr(cls, name)  # fallback to cls.__fields, getattr
+        return own
+
+    @staticmethod
+    def __field_type(value):
+        # same as BaseType.__ensure__(), but without raising exceptions
+        # for members that are not fields, such as methods
+        if isinstance(value, type) and issubclass(value, BaseType):
+            return value
+        try:
+            return map_python_to_graphql.get(value)
+        except TypeError:  # unhashable
+            return None
+
+    def __decoder__(cls, selection_list=None):
+        '''Compiled steps to decode JSON objects into instances.
+
+        Returns an :class:`collections.OrderedDict` mapping ``name``
+        to a tuple
+        ``(json_key, name, field, type, selection_list, pass_thru,
+        convert)`` for each field to be decoded, where ``json_key`` is
+        the key in the JSON object (alias or GraphQL name) and
+        ``name`` is the attribute to set (alias or field name). The
+        ``type`` is the field's :func:`Field.decode_type`, JSON values
+        of class ``pass_thru`` are used as is, see
+        :func:`BaseMeta.__pass_thru__()`, others are given to
+        ``convert``, see :func:`BaseMeta.__converter__()`.
+
+        Without a selection list (or an empty one) all fields are
+        used. Otherwise the selections applying to this type are used,
+        including those of inline fragments of interfaces and unions,
+        see :func:`sgqlc.operation.SelectionList.__selections_for__()`.
+        The steps are computed once per type and selection list, being
+        cached in the selection list's ``__decoders__``.
+
+        Since these describe the shape of decoded objects, instances
+        that got all fields share it as their ``__fields_cache__``,
+        thus it must not be modified.
+        '''
+        if not selection_list:
+            # also rebuilt if Field.intern changed, see decode_type
+            generation = (cls.__schema__.__generation__,
+                          Field._intern_changes)
+            if cls.__decoder is None or \
+                    cls.__decoder_generation != generation:
+                cls.__decoder = OrderedDict(
+                    (f.name, cls.__decoder_step(
+                        f.graphql_name, f.name, f, None))
+                    for f in cls)
+                cls.__decoder_generation = generation
+            return cls.__decoder
+
+        cache = selection_list.__decoders__
+        steps = cache.get(cls)
+        if steps is None:
+            steps = cache[cls] = OrderedDict()
+            for sel in selection_list.__selections_for__(cls):
+                field = sel.__field__
+                alias = sel.__alias__
+                name = alias or field.name
+                steps[name] = cls.__decoder_step(
+                    alias or field.graphql_name,
+                    name,
+                    field,
+                    sel.__selection_list__,
+                )
+        return steps
+
+    def __decoder_step(cls, json_key, name, field, selection_list):
+        typ = field.decode_type
+        return (json_key, name, field, typ, selection_list,
+                typ.__pass_thru__(), typ.__converter__(cls.__frozen__))
+
+    def __slotted_class__(cls, selection_list=None):
+        '''Subclass using ``__slots__`` to hold only the selected fields.
+
+        The class is created once per selection list, cached in its
+        ``__decoders__``, or once per type if there is no selection
+        list, holding all fields. Instances do not keep the JSON
+        backing store and the selection list is a shared class member,
+        thus changes are not reflected back to the JSON data.
+        '''
+        if selection_list is None:
+            fields_cache = cls.__decoder__()
+            cached = cls.__slotted
+            if cached is not None and cached[0] is fields_cache:
+                return cached[1]
+        else:
+            key = (cls, '__slots__')
+            cache = selection_list.__decoders__
+            slotted = cache.get(key)
+            if slotted is not None:
+                return slotted
+            fields_cache = cls.__decoder__(selection_list)
+
+        slots = tuple(fields_cache.keys()) + ('__fields_cache__',)
+        if cls.__frozen__:
+            slots += ('__frozen_hash__',)
+
+        name = cls.__name__
+        slotted = type(cls)(name, (cls,), {
+            '__slots__': slots,
+            '__module__': cls.__module__,
+            '__qualname__': cls.__qualname__,
+            '__new__': _slotted_new,
+            '__init__': cls.__slotted_init(fields_cache),
+            '__selection_list__': selection_list,
+            '_%s__auto_register' % name: False,
+        })
+        if selection_list is None:
+            cls.__slotted = (fields_cache, slotted)
+        else:
+            cache[key] = slotted
+        return slotted
+
+    @staticmethod
+    def __slotted_init(fields_cache):
+        steps = tuple(fields_cache.values())
+
+        def __init__(self, json_data, selection_list=None):
+            if json_data is None:
+                object.__setattr__(self, '__fields_cache__', OrderedDict())
+                return
+
+            object.__setattr__(self, '__fields_cache__', fields_cache)
+            for json_key, name, _, _, sub_selection_list, pass_thru, \
+                    convert in steps:
+                try:
+                    value = json_data[json_key]
+                except KeyError:
+                    # rare: only copy the shared fields cache if needed
+                    object.__setattr__(self, '__fields_cache__', OrderedDict(
+                        (k, v) for k, v in fields_cache.items()
+                        if v[0] in json_data))
+                    continue
+                if value.__class__ is not pass_thru:
+                    value = _convert_field(
+                        self, name, value, convert, sub_selection_list)
+                object.__setattr__(self, name, value)
+
+        return __init__
+
+    def __to_columns__(cls, json_data, selection_list=None,
+                       use_numpy=False):
+        '''Decode a list of JSON objects into columns.
+
+        Instead of creating one instance per object, each selected
+        field is converted into a column with its values for all
+        objects (struct of arrays). Columns of :class:`Int`,
+        :class:`Float` and :class:`Boolean` are :class:`array.array`
+        (or :mod:`numpy` arrays if ``use_numpy`` and it's available)
+        unless they contain ``null``, nested container types result in
+        nested columns and other types in lists of converted values.
+
+        :param json_data: list of JSON objects, as returned by the
+          server for a ``list_of()`` field such as ``Connection.nodes``.
+        :type json_data: list
+
+        :param selection_list: the selection used to query such
+          objects, if ``None`` all fields are used.
+        :type selection_list: :class:`sgqlc.operation.SelectionList`
+
+        :param use_numpy: whether to return :mod:`numpy` arrays when
+          possible.
+        :type use_numpy: bool
+
+        :return: mapping of field name (or alias) to its column.
+        :rtype: ODict
+        '''
+        if json_data is None:
+            return None
+
+        columns = ODict()
+        for json_key, name, _, typ, sub_selection_list, _, _ in \
+                cls.__decoder__(selection_list).values():
+            values = [None if v is None else v.get(json_key)
+                      for v in json_data]
+            columns[name] = typ.__to_column__(
+                values, sub_selection_list, use_numpy)
+        return columns
+
+    def __to_column__(cls, values, selection_list=None, use_numpy=False):
+        return cls.__to_columns__(values, selection_list, use_numpy)
 
     def __getitem__(cls, key):
         try:
-            return cls.__fields[key]
+            return cls.__get_fields()[key]
         except KeyError as exc:
             raise KeyError('%s has no field %s' % (cls, key)) from exc
 
     def __getattr__(cls, key):
+        fields = cls.__fields
+        if fields is None and not key.startswith('_'):
+            cls.__get_fields()  # deferred, may also restore non-fields
+            return getattr(cls, key)
         try:
-            return cls.__fields[key]
-        except KeyError as exc:
+            return fields[key]
+        except (KeyError, TypeError) as exc:
             raise AttributeError('%s has no field %s' % (cls, key)) from exc
 
     def __dir__(cls):
-        original_dir = super(ContainerTypeMeta, cls).__dir__(cls)
+        original_dir = super(ContainerTypeMeta, cls).__dir__()
         try:
-            fields = list(cls.__fields.keys())
+            fields = list(cls.__get_fields().keys())
         except AttributeError as e:
             fields = []
         return sorted(original_dir + fields)
 
     def __iter__(cls):
-        return iter(cls.__fields.values())
+        return iter(cls.__get_fields().values())
 
     def __contains__(cls, field_name):
-        return field_name in cls.__fields
+        return field_name in cls.__get_fields()
 
     def __to_graphql__(cls, indent=0, indent_string='  '):
         d = BaseMeta.__to_graphql__(cls, indent, indent_string)
@@ -552,14 +1399,26 @@ class ContainerTypeMeta(BaseMeta):
     def __to_json_value__(cls, value):
         if value is None:
             return None
+        if isinstance(value, ContainerType) and value.__class__ is not cls:
+            # subclass, such as the possible type of an interface
+            if cls.__kind__ == 'interface' and \
+                    value.__class__.__kind__ != 'interface':
+                return _typed_json_value(value)
+            return value.__to_json_value__()
         d = {}
-        for name, f in cls.__fields.items():
+        for name, f in cls.__get_fields().items():
             # elements may not exist since not queried and would
             # trigger exception for non-null fields
             if name in value:
-                d[f.graphql_name] = f.type.__to_json_value__(value[name])
+                d[f.graphql_name] = f.type.__json_encoder__()(value[name])
         return d
 
+    def __json_encoder__(cls):
+        def encode(value):
+            return ContainerTypeMeta.__to_json_value__(cls, value)
+
+        return encode
+
 
 class ContainerType(BaseType, metaclass=ContainerTypeMeta):
     '''Container of :class:`Field`.
@@ -590,51 +1449,303 @@ class ContainerType(BaseType, metaclass=ContainerTypeMeta):
     Fields from all bases (interfaces, etc) are merged.
 
     Members started with underscore (``_``) are not processed.
+
+    By default all selected fields are converted to native Python
+    objects when the container is created, recursively. Classes that
+    set ``__lazy__ = True`` will keep the JSON data and only convert
+    (and cache) each field when it is first accessed, making the
+    creation cost proportional to the fields that are actually used.
+    The flag is inherited, so it may be set in a common base class.
+
+    >>> schema = Schema()
+    >>> class Label(Type):
+    ...     __schema__ = schema
+    ...     name = str
+    ...     color = str
+    >>> class Issue(Type):
+    ...     __schema__ = schema
+    ...     number = int
+    ...     labels = list_of(Label)
+    >>> json_data = {'number': 1, 'labels': [{'name': 'bug', 'color': 'red'}]}
+    >>> class LazyIssue(Issue):
+    ...     __lazy__ = True
+    >>> issue = LazyIssue(json_data)
+    >>> 'labels' in issue.__dict__  # not converted yet
+    False
+    >>> issue.labels
+    [Label(color='red', name='bug')]
+    >>> 'labels' in issue.__dict__
+    True
+    >>> issue.__to_json_value__() == json_data
+    True
+
+    Assigning a field updates the JSON backing store, even if the
+    field was not decoded before (not selected or the instance was
+    created without JSON data), thus it's included in
+    ``__to_json_value__()`` and ``bytes()``:
+
+    >>> issue = Issue({'number': 1})
+    >>> issue.labels = [Label({'name': 'bug'})]
+    >>> 'labels' in issue, bytes(issue)
+    (True, b'{"labels":[{"name":"bug"}],"number":1}')
+    >>> class IssueInput(Input):
+    ...     __schema__ = schema
+    ...     number = int
+    >>> issue_input = IssueInput(None)
+    >>> issue_input.number = 3
+    >>> issue_input.__to_json_value__()
+    {'number': 3}
+
+    Classes that set ``__slotted__ = True``, and their subclasses,
+    produce instances of a subclass generated per selection (see
+    :func:`ContainerTypeMeta.__slotted_class__()`) that uses
+    ``__slots__`` to store only the selected fields, or all of them
+    if decoded without a selection list. These do not have a
+    ``__dict__`` as long as all their bases are slotted as well, so
+    it must be set by classes deriving directly from :class:`Type`
+    or :class:`Interface`. This greatly reduces the memory of large
+    decoded results, however the JSON backing store is not kept and
+    these are always converted eagerly (``__lazy__`` is ignored).
+
+    >>> from sgqlc.operation import Operation
+    >>> class SlottedIssue(Type):
+    ...     __schema__ = schema
+    ...     __slotted__ = True
+    ...     number = int
+    ...     title = str
+    >>> class Query(Type):
+    ...     __schema__ = schema
+    ...     issue = SlottedIssue
+    >>> op = Operation(Query)
+    >>> op.issue.number()
+    number
+    >>> issue = (op + {'data': {'issue': {'number': 2}}}).issue
+    >>> issue
+    SlottedIssue(number=2)
+    >>> hasattr(issue, '__dict__'), isinstance(issue, SlottedIssue)
+    (False, True)
+    >>> issue.__to_json_value__()
+    {'number': 2}
+    >>> SlottedIssue({'number': 3, 'title': 'x'})
+    SlottedIssue(number=3, title='x')
+
+    Classes that set ``__single_copy__ = True`` will hold each field
+    only once, instead of both the converted value and the JSON
+    object given to the constructor. Fields are kept converted,
+    unless their type sets ``__store_raw__ = True`` (see
+    :class:`Scalar`), and ``__json_data__`` only holds the JSON values
+    of these (and of lazy fields not yet accessed). Use
+    ``__to_json_value__()`` or ``bytes()`` to get the JSON
+    representation, which is created on demand. Decoding the issues
+    of ``utils/benchmark/decode.py``, this uses about 44% less memory
+    than the default, or 67% less if strings are interned as well
+    (see :func:`interned()`).
+
+    >>> class SingleCopyIssue(Issue):
+    ...     __single_copy__ = True
+    >>> issue = SingleCopyIssue(json_data)
+    >>> issue.__json_data__  # all fields were converted
+    {}
+    >>> issue.number, issue.labels
+    (1, [Label(color='red', name='bug')])
+    >>> issue.__to_json_value__() == json_data
+    True
+
+    Classes that set ``__frozen__ = True`` produce read-only
+    instances: assigning or deleting attributes raises
+    :exc:`AttributeError` and lists are decoded as tuples (see
+    :func:`BaseMeta.__converter__()`). These are compared by value and
+    are hashable, with the hash computed once and cached, thus they may
+    be used as dict keys or set members. Note that nested containers are only
+    frozen if their classes are as well, so it's better to set it in a
+    common base class.
+
+    >>> class FrozenLabel(Label):
+    ...     __frozen__ = True
+    >>> class FrozenIssue(Issue):
+    ...     __frozen__ = True
+    ...     labels = list_of(FrozenLabel)
+    >>> issue = FrozenIssue(json_data)
+    >>> issue.number, issue.labels
+    (1, (FrozenLabel(color='red', name='bug'),))
+    >>> issue == FrozenIssue(json_data)
+    True
+    >>> len({issue, FrozenIssue(json_data)})
+    1
+    >>> issue.__to_json_value__() == json_data
+    True
+    >>> issue.number = 2
+    Traceback (most recent call last):
+      ...
+    AttributeError: FrozenIssue is frozen, cannot set number
+    >>> del issue.labels
+    Traceback (most recent call last):
+      ...
+    AttributeError: FrozenIssue is frozen, cannot delete labels
     '''
 
+    __slots__ = ()
+    __lazy__ = False
+    __slotted__ = False
+    __single_copy__ = False
+    __frozen__ = False
+
+    def __new__(cls, json_data=None, selection_list=None):
+        if cls.__slotted__:
+            cls = cls.__slotted_class__(selection_list)
+        return super(ContainerType, cls).__new__(cls)
+
     def __init__(self, json_data, selection_list=None):
         object.__setattr__(self, '__selection_list__', selection_list)
-        cache = OrderedDict()
-        object.__setattr__(self, '__fields_cache__', cache)
         if json_data is None:
-            # backing store, changed by setattr()
-            object.__setattr__(self, '__json_data__', {})
-            return
-
-        def set_field(name, field):
-            graphql_name = field.graphql_name
-            if graphql_name in json_data:
-                try:
-                    value = json_data[graphql_name]
-                    value = field.type(value)
-                    setattr(self, name, value)
-                    cache[name] = field
-                except Exception as exc:
-                    raise ValueError('%s selection %r: %r (%s)' % (
-                        self.__class__, name, value, exc)) from exc
-
-        if self.__selection_list__ is not None:
-            for sel in self.__selection_list__:
-                field = sel.__field__
-                name = sel.__alias__ or field.name
-                set_field(name, field)
+            steps = OrderedDict()
+            backing_store = {}
         else:
-            for field in self.__class__:
-                set_field(field.name, field)
-
+            steps = self.__class__.__decoder__(selection_list)
+            if self.__lazy__ or self.__single_copy__:
+                backing_store, missing = self.__keep_fields(json_data, steps)
+            else:
+                backing_store = json_data
+                missing = self.__convert_fields(json_data, steps)
+            if missing:
+                steps = OrderedDict(
+                    (k, v) for k, v in steps.items() if v[0] in json_data)
+        # usually shared by all instances, see ContainerTypeMeta.__decoder__()
+        object.__setattr__(self, '__fields_cache__', steps)
         # backing store, changed by setattr()
-        object.__setattr__(self, '__json_data__', json_data)
+        object.__setattr__(self, '__json_data__', backing_store)
 
-    def __setattr__(self, name, value):
+    def __convert_fields(self, json_data, steps):
+        # eager: all fields are converted, json_data is the backing store
+        missing = False
+        for json_key, name, _, _, sub_selection_list, pass_thru, \
+                convert in steps.values():
+            try:
+                value = json_data[json_key]
+            except KeyError:
+                missing = True
+                continue
+            if value.__class__ is not pass_thru:
+                value = _convert_field(
+                    self, name, value, convert, sub_selection_list)
+            object.__setattr__(self, name, value)
+        return missing
+
+    def __keep_fields(self, json_data, steps):
+        # lazy fields are converted on first access (see __getattr__()),
+        # single copy only keeps the JSON values not converted yet
+        lazy = self.__lazy__
+        single_copy = self.__single_copy__
+        backing_store = {} if single_copy else json_data
+        missing = False
+        for json_key, name, _, typ, sub_selection_list, pass_thru, \
+                convert in steps.values():
+            try:
+                value = json_data[json_key]
+            except KeyError:
+                missing = True
+                continue
+            if lazy or typ.__store_raw__:
+                if single_copy:
+                    backing_store[json_key] = value
+                continue
+            if value.__class__ is not pass_thru:
+                value = _convert_field(
+                    self, name, value, convert, sub_selection_list)
+            object.__setattr__(self, name, value)
+        if single_copy and not backing_store:
+            backing_store = _no_json_data  # shared, see __setattr__()
+        return backing_store, missing
+
+    def __getattr__(self, name):
+        # only reached for missing attributes: convert lazy fields
+        try:
+            step = object.__getattribute__(self, '__fields_cache__')[name]
+            json_data = object.__getattribute__(self, '__json_data__')
+        except (AttributeError, KeyError) as exc:
+            raise AttributeError('%s has no field %s' % (
+                self.__class__.__name__, name)) from exc
+
+        json_key, _, _, typ, sub_selection_list, pass_thru, convert = step
+        value = json_data[json_key]
+        if value.__class__ is not pass_thru:
+            value = _convert_field(
+                self, name, value, convert, sub_selection_list)
+        if self.__single_copy__:
+            if typ.__store_raw__:
+                return value  # kept as JSON, converted on every access
+            del json_data[json_key]
         object.__setattr__(self, name, value)
+        return value
+
+    def __setattr__(self, name, value):
+        if self.__frozen__:
+            raise AttributeError('%s is frozen, cannot set %s' % (
+                self.__class__.__name__, name))
         if not hasattr(self, '__json_data__'):  # still populating
+            object.__setattr__(self, name, value)
             return
         # apply changes to json backing store, if name is known
-        field = self.__fields_cache__.get(name)
-        if field is None:
+        cache = self.__fields_cache__
+        step = cache.get(name)
+        if step is None:
+            step = self.__class__.__decoder__().get(name)
+            if step is None:
+                object.__setattr__(self, name, value)
+                return
+            # copy on write, it's usually shared
+            cache = OrderedDict(cache)
+            cache[name] = step
+            object.__setattr__(self, '__fields_cache__', cache)
+        json_key, _, _, typ, _, _, _ = step
+        json_data = self.__json_data__
+        if not self.__single_copy__:
+            json_data[json_key] = typ.__json_encoder__()(value)
+        elif typ.__store_raw__:
+            if json_data is _no_json_data:
+                json_data = {}
+                object.__setattr__(self, '__json_data__', json_data)
+            json_data[json_key] = typ.__json_encoder__()(value)
             return
-        json_value = field.type.__to_json_value__(value)
-        self.__json_data__[field.graphql_name] = json_value
+        else:
+            json_data.pop(json_key, None)  # lazy, not converted yet
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+        if self.__frozen__:
+            raise AttributeError('%s is frozen, cannot delete %s' % (
+                self.__class__.__name__, name))
+        cache = self.__fields_cache__
+        if name not in cache:
+            object.__delattr__(self, name)
+            return
+        try:
+            object.__delattr__(self, name)
+        except AttributeError:
+            pass  # lazy field that was not converted yet
+        # copy on write, it's usually shared
+        cache = OrderedDict((k, v) for k, v in cache.items() if k != name)
+        object.__setattr__(self, '__fields_cache__', cache)
+
+    def __eq__(self, other):
+        if not self.__frozen__ or self.__class__ is not other.__class__:
+            return NotImplemented  # identity, as object
+        return tuple(self.__items()) == tuple(other.__items())
+
+    def __hash__(self):
+        if not self.__frozen__:
+            return object.__hash__(self)
+        try:
+            return object.__getattribute__(self, '__frozen_hash__')
+        except AttributeError:
+            pass
+        value = hash((self.__class__, tuple(self.__items())))
+        object.__setattr__(self, '__frozen_hash__', value)
+        return value
+
+    def __items(self):
+        for name in self:
+            yield name, getattr(self, name)
 
     def __getitem__(self, name):
         try:
@@ -649,13 +1760,10 @@ class ContainerType(BaseType, metaclass=ContainerTypeMeta):
         return iter(self.__fields_cache__.keys())
 
     def __contains__(self, name):
-        return hasattr(self, name)
+        return name in self.__fields_cache__
 
     def __len__(self):
-        i = 0
-        for name in self:
-            i += 1
-        return i
+        return len(self.__fields_cache__)
 
     def __str__(self):
         r = []
@@ -678,16 +1786,32 @@ class ContainerType(BaseType, metaclass=ContainerTypeMeta):
             sort_keys=True, separators=(',', ':')), 'utf-8')
 
 
+def _resolve_type_name(schema, name):
+    if name.endswith('!'):
+        return non_null(_resolve_type_name(schema, name[:-1]))
+    elif name.startswith('[') and name.endswith(']'):
+        return list_of(_resolve_type_name(schema, name[1:-1]))
+    return schema[name]
+
+
+_graphql_names = {}  # see BaseItem._to_graphql_name()
+
+
 class BaseItem:
     '''Base item for :class:`Arg` and :class:`Field`.
 
     Each parameter has a GraphQL type, such as a derived class from
     :class:`Scalar` or :class:`Type`, this is used for nesting,
     conversion to native Python types, generating queries, etc.
+
+    Types given as string are resolved in the schema once, until it's
+    changed by ``schema -= type``, see :class:`Schema`. These may use
+    the GraphQL notation for :func:`non_null()` and :func:`list_of()`,
+    such as ``'[Issue!]!'``.
     '''
 
     __slots__ = (
-        '_type', 'graphql_name', 'name', 'schema', 'container',
+        '_type', '_resolved', 'graphql_name', 'name', 'schema', 'container',
     )
 
     def __init__(self, typ, graphql_name=None):
@@ -704,7 +1828,10 @@ class BaseItem:
           ``Arg._to_graphql_name()``
         :type graphql_name: str
         '''
-        self._type = BaseType.__ensure__(typ)
+        if not isinstance(typ, str):
+            typ = BaseType.__ensure__(typ)
+        self._type = typ
+        self._resolved = None  # (schema.__generation__, type)
         self.graphql_name = graphql_name
         self.name = None
         self.schema = None
@@ -719,16 +1846,30 @@ class BaseItem:
 
     @property
     def type(self):
-        if not isinstance(self._type, str):
-            return self._type
-        return self.schema[self._type]
+        typ = self._type
+        if not isinstance(typ, str):
+            return typ
+        generation = self.schema.__generation__
+        resolved = self._resolved
+        if resolved is None or resolved[0] != generation:
+            resolved = self._resolved = (
+                generation, _resolve_type_name(self.schema, typ))
+        return resolved[1]
 
     @staticmethod
     def _to_graphql_name(name):
         '''Converts a Python name, ``a_name`` to GraphQL: ``aName``.
+
+        Results are cached, the same names are used by many types.
         '''
+        try:
+            return _graphql_names[name]
+        except KeyError:
+            pass
         parts = name.split('_')
-        return ''.join(parts[:1] + [p.title() for p in parts[1:]])
+        graphql_name = ''.join(parts[:1] + [p.title() for p in parts[1:]])
+        graphql_name = _graphql_names[name] = sys.intern(graphql_name)
+        return graphql_name
 
     def __str__(self):
         return self.name
@@ -745,6 +1886,11 @@ class BaseItem:
 
 class Variable:
     '''GraphQL variable: ``$varName``
+
+    May be given as the value of field arguments, referring to the
+    variables declared by :class:`sgqlc.operation.Operation`. The
+    name is converted to GraphQL as in :class:`Field`, thus
+    ``Variable('repo_name')`` is ``$repoName``.
     '''
 
     __slots__ = ('name',)
@@ -761,8 +1907,8 @@ class Variable:
     def __bytes__(self):
         return bytes(self.__to_graphql__(indent_string=''), 'utf-8')
 
-    def __to_graphql__(self):
-        return '$' + self.name
+    def __to_graphql__(self, indent=0, indent_string='  '):
+        return '$' + BaseItem._to_graphql_name(self.name)
 
     @classmethod
     def __to_graphql_input__(cls, value, indent=0, indent_string='  '):
@@ -792,8 +1938,8 @@ class Arg(BaseItem):
         '''
         super(Arg, self).__init__(typ, graphql_name)
         self.default = default
-        if default is not None:
-            assert typ(default)
+        if default is not None and not isinstance(typ, str):
+            typ(default)  # raises if invalid, 0 or False are valid
 
     def __to_graphql__(self, indent=0, indent_string='  '):
         default = ''
@@ -804,7 +1950,10 @@ class Arg(BaseItem):
         return '%s: %s%s' % (self.graphql_name, self.type, default)
 
     def __to_graphql_input__(self, value, indent=0, indent_string='  '):
-        v = self.type.__to_graphql_input__(value, indent, indent_string)
+        if isinstance(value, Variable):
+            v = value.__to_graphql__()
+        else:
+            v = self.type.__to_graphql_input__(value, indent, indent_string)
         return '%s: %s' % (self.graphql_name, v)
 
 
@@ -910,6 +2059,20 @@ class ArgDict(OrderedDict):
         return bytes(self.__to_graphql__(indent_string=''), 'utf-8')
 
 
+class _EmptyArgDict(ArgDict):
+    # the single instance is shared by all fields without arguments,
+    # thus it must not be modified
+    def __read_only(self, *args, **kwargs):
+        raise TypeError('arguments of fields without arguments are '
+                        'read-only, create the Field with args')
+
+    __setitem__ = __delitem__ = __ior__ = __read_only
+    clear = pop = popitem = setdefault = update = __read_only
+
+
+_no_args = _EmptyArgDict()
+
+
 class Field(BaseItem):
     '''Field in a :class:`Type` container.
 
@@ -918,9 +2081,10 @@ class Field(BaseItem):
     conversion to native Python types, generating queries, etc.
     '''
 
-    __slots__ = ('args',)
+    __slots__ = ('args', '_intern')
+    _intern_changes = 0  # invalidates ContainerTypeMeta.__decoder__()
 
-    def __init__(self, typ, graphql_name=None, args=None):
+    def __init__(self, typ, graphql_name=None, args=None, intern=None):
         '''
         :param typ: the :class:`Scalar` or :class:`Type` derived
           class. If this would cause a cross reference and the other
@@ -938,11 +2102,58 @@ class Field(BaseItem):
           compatible type (dict, or iterable of key-value pairs). The
           value may be a mapped Python type (ie: ``str``), explicit
           type (ie: ``String``), type name (ie: ``"String"``, to allow
-          cross references) or :class:`Arg` instances.
+          cross references) or :class:`Arg` instances. Fields without
+          arguments share a single, read-only, empty :class:`ArgDict`.
         :type args: :class:`ArgDict`
+
+        :param intern: whether strings should be decoded with
+          :func:`interned()` types. If ``None``, the schema ``intern``
+          is used, see :class:`Schema`.
+        :type intern: bool
         '''
         super(Field, self).__init__(typ, graphql_name)
-        self.args = ArgDict(args)
+        self.args = ArgDict(args) if args else _no_args
+        self._intern = intern
+
+    @property
+    def intern(self):
+        '''Whether strings are decoded with :func:`interned()` types.
+
+        May be changed after the field is created, however objects
+        decoded with selection lists that were already used keep
+        their decoders, see :func:`ContainerTypeMeta.__decoder__()`.
+
+        >>> class Account(Type):
+        ...     __schema__ = Schema()
+        ...     login = str
+        >>> def decode_twice():
+        ...     a = Account({'login': ''.join(['us', 'er'])})
+        ...     b = Account({'login': ''.join(['u', 'ser'])})
+        ...     return a.login is b.login
+        >>> decode_twice()
+        False
+        >>> Account.login.intern = True
+        >>> decode_twice()
+        True
+        '''
+        return self._intern
+
+    @intern.setter
+    def intern(self, intern):
+        self._intern = intern
+        Field._intern_changes += 1
+
+    @property
+    def decode_type(self):
+        '''The type used to decode JSON values.
+
+        This is the :func:`interned()` type if ``intern`` is set for
+        the field or its schema, otherwise the same as ``type``.
+        '''
+        intern = self.intern
+        if intern is None:
+            intern = self.schema is not None and self.schema.__intern__
+        return interned(self.type) if intern else self.type
 
     def _set_container(self, schema, container, name):
         super(Field, self)._set_container(schema, container, name)
@@ -968,6 +2179,7 @@ class Type(ContainerType):
     also making their fields automatically available in the final
     class.
     '''
+    __slots__ = ()
     __kind__ = 'type'
 
 
@@ -980,11 +2192,13 @@ class Interface(ContainerType):
     also making their fields automatically available in the final
     class.
     '''
+    __slots__ = ()
     __kind__ = 'interface'
 
 
 class Input(ContainerType):
     'GraphQL ``input Name``.'
+    __slots__ = ()
     __kind__ = 'input'
 
     @classmethod
@@ -1005,11 +2219,15 @@ class Input(ContainerType):
 class Int(Scalar):
     'Maps GraphQL ``Int`` to Python ``int``.'
     converter = int
+    __column_typecode__ = 'q'
+    __column_dtype__ = 'int64'
 
 
 class Float(Scalar):
     'Maps GraphQL ``Float`` to Python ``float``.'
     converter = float
+    __column_typecode__ = 'd'
+    __column_dtype__ = 'float64'
 
 
 class String(Scalar):
@@ -1020,6 +2238,8 @@ class String(Scalar):
 class Boolean(Scalar):
     'Maps GraphQL ``Boolean`` to Python ``bool``.'
     converter = bool
+    __column_typecode__ = 'b'
+    __column_dtype__ = 'bool'
 
 
 class ID(Scalar):
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+
+'''
+Decoding benchmark
+~~~~~~~~~~~~~~~~~~
+
+Measures the time to interpret a large JSON response, simulating a
+``Connection`` with many nodes, using ``operation + data``.
+
+Usage::
+
+   $ PYTHONPATH=. python3 utils/benchmark/decode.py --nodes 100000
+
+:license: ISC
+'''
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from collections import OrderedDict
+
+from sgqlc.types import Schema, Type, Field, Enum, list_of, non_null
+from sgqlc.types.datetime import DateTime
+from sgqlc.types.relay import Connection, connection_args
+from sgqlc.operation import Operation
+
+
+class IssueState(Enum):
+    __choices__ = ('OPEN', 'CLOSED')
+
+
+def gen_schema(flags, intern):
+    # types are declared per mode, since __slotted__ must be set when
+    # creating the classes, given by a common base class
+    schema = Schema()
+    Base = type(Type)('Base', (Type,), dict(
+        flags, __schema__=schema, _Base__auto_register=False))
+
+    class Actor(Base):
+        login = Field(str, intern=intern)
+        url = Field(str, intern=intern)
+
+    class Label(Base):
+        name = Field(non_null(str), intern=intern)
+        color = Field(str, intern=intern)
+
+    class Issue(Base):
+        id = non_null(id)  # noqa: A003
+        number = non_null(int)
+        title = str
+        closed = bool
+        state = IssueState
+        created_at = DateTime
+        author = Actor
+        labels = non_null(list_of(non_null(Label)))
+        assignees = Field(list_of(non_null(str)), intern=intern)
+
+    class IssueConnection(Connection, Base):
+        nodes = list_of(Issue)
+
+    class Repository(Base):
+        issues = Field(IssueConnection, args=connection_args())
+
+    class Query(Base):
+        repository = Field(Repository, args={'owner': str, 'name': str})
+
+    return Query
+
+
+def gen_data(n, labels):
+    return {'data': {'repository': {'issues': {
+        'totalCount': n,
+        'pageInfo': {'hasNextPage': False, 'hasPreviousPage': False},
+        'nodes': [{
+            'id': 'MDU6SXNzdWUx%06d' % i,
+            'number': i,
+            'title': 'Issue title %d' % i,
+            'closed': bool(i % 2),
+            'state': ('OPEN', 'CLOSED')[i % 2],
+            'createdAt': '2018-01-18T10:20:30Z',
+            'author': {'login': 'user%d' % (i % 100), 'url': 'http://x'},
+            'labels': [{'name': 'label%d' % j, 'color': 'ff0000'}
+                       for j in range(labels)],
+            'assignees': ['user%d' % ((i + j) % 100) for j in range(labels)],
+        } for i in range(n)],
+    }}}}
+
+
+def gen_operation(query):
+    op = Operation(query)
+    issues = op.repository(owner='o', name='n').issues(first=100)
+    issues.total_count()
+    issues.page_info.__fields__()
+    issues.nodes.__fields__()
+    return op
+
+
+def decode_and_sum(op, data):
+    obj = op + data
+    sum(node.number for node in obj.repository.issues.nodes)
+    return obj
+
+
+def bench(label, func, text, n, repeat):
+    best = None
+    for _ in range(repeat):
+        data = json.loads(text)
+        t0 = time.perf_counter()
+        func(data)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+        del data
+
+    # resident size of the result, once the JSON data is released
+    gc.collect()
+    tracemalloc.start()
+    data = json.loads(text)
+    result = func(data)  # noqa: F841 (keep it alive while measuring)
+    del data
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    sys.stdout.write('%-20s %8.3fs total %8.3fus/node %8d bytes/node\n' % (
+        label, best, best * 1e6 / n, size / n))
+
+
+def decode_and_inspect(op, data):
+    obj = op + data
+    for node in obj.repository.issues.nodes:
+        len(node)
+        'number' in node
+        'unknown' in node
+    return obj
+
+
+def columns_and_sum(op, data):
+    columns = op.__to_columns__(data, 'repository.issues.nodes')
+    sum(columns.number)
+    return columns
+
+
+# mode: (flags of all types, intern repeated strings, func)
+modes = OrderedDict([
+    ('eager', ({}, None, decode_and_sum)),
+    ('lazy', ({'__lazy__': True}, None, decode_and_sum)),
+    ('slotted', ({'__slotted__': True}, None, decode_and_sum)),
+    ('single-copy', ({'__single_copy__': True}, None, decode_and_sum)),
+    ('frozen', ({'__frozen__': True}, None, decode_and_sum)),
+    # enumerations are always interned. The JSON backing store keeps
+    # the original strings, so eager decoding uses more memory
+    ('interned', ({}, True, decode_and_sum)),
+    ('slotted+interned', ({'__slotted__': True}, True, decode_and_sum)),
+    ('single-copy+interned', ({'__single_copy__': True}, True,
+                              decode_and_sum)),
+    ('columns', ({}, None, columns_and_sum)),
+    ('len+contains', ({}, None, decode_and_inspect)),
+])
+
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description='Benchmark JSON decoding')
+    ap.add_argument('--nodes', '-n', type=int, default=100000,
+                    help='Number of connection nodes to decode.')
+    ap.add_argument('--labels', '-l', type=int, default=5,
+                    help='Number of labels and assignees (lists) per node.')
+    ap.add_argument('--repeat', '-r', type=int, default=3,
+                    help='Number of repetitions, the best is reported.')
+    ap.add_argument('--mode', '-m', action='append', choices=modes.keys(),
+                    help='Decoding modes to benchmark. Default: all')
+    args = ap.parse_args()
+
+    text = json.dumps(gen_data(args.nodes, args.labels))
+    for mode in args.mode or modes.keys():
+        flags, intern, func = modes[mode]
+        op = gen_operation(gen_schema(flags, intern))
+        bench(mode, lambda data: func(op, data), text, args.nodes,
+              args.repeat)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+'''
+Named fragments benchmark
+~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Measures the size of the text sent by endpoints (``bytes()``) with
+repeated selections extracted as named fragments, compared to
+minifying the whole selection tree, and the time to render each.
+
+The operation selects the issues of many aliased repositories, each
+with the same selections of actors, labels and page information,
+as dashboards usually do.
+
+Usage::
+
+   $ PYTHONPATH=. python3 utils/benchmark/fragments.py --repositories 100
+
+:license: ISC
+'''
+
+import argparse
+import sys
+import time
+
+from sgqlc.types import Type, Field, list_of, non_null
+from sgqlc.types.datetime import DateTime
+from sgqlc.types.relay import Node, Connection, connection_args
+from sgqlc.operation import Operation, minify
+
+
+class Actor(Type):
+    login = str
+    url = str
+    avatar_url = str
+
+
+class Label(Type):
+    name = non_null(str)
+    color = str
+    description = str
+
+
+class LabelConnection(Connection):
+    nodes = list_of(Label)
+
+
+class Issue(Type, Node):
+    number = non_null(int)
+    title = str
+    created_at = DateTime
+    author = Actor
+    assignees = list_of(Actor)
+    labels = Field(LabelConnection, args=connection_args())
+
+
+class IssueConnection(Connection):
+    nodes = list_of(Issue)
+
+
+class Repository(Type):
+    issues = Field(IssueConnection, args=connection_args())
+
+
+class Query(Type):
+    repository = Field(Repository, args={'owner': str, 'name': str})
+
+
+def gen_operation(repositories):
+    op = Operation(Query)
+    for i in range(repositories):
+        repo = op.repository(owner='o', name='r%d' % i, __alias__='r%d' % i)
+        issues = repo.issues(first=100)
+        issues.page_info.__fields__()
+        issues.total_count()
+        issues.nodes.__fields__('number', 'title', 'created_at')
+        issues.nodes.author.__fields__()
+        issues.nodes.assignees.__fields__()
+        labels = issues.nodes.labels(first=10)
+        labels.page_info.__fields__()
+        labels.nodes.__fields__()
+    return op
+
+
+def measure(render, repeat):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        text = render()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best, text
+
+
+def render(op, auto_fragments):
+    # __to_graphql__() is cached, render it every time
+    chunks = []
+    op.__write_graphql__(chunks.append, 0, '', auto_fragments)
+    return minify(''.join(chunks))
+
+
+def bench(repositories, repeat):
+    op = gen_operation(repositories)
+    plain_elapsed, plain = measure(lambda: render(op, False), repeat)
+    fragments_elapsed, fragments = measure(lambda: render(op, True), repeat)
+    sys.stdout.write(
+        '%5d repositories %9d bytes %8.3fms, fragments: %7d bytes '
+        '%8.3fms\n' % (repositories, len(plain), plain_elapsed * 1e3,
+                       len(fragments), fragments_elapsed * 1e3))
+
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description='Benchmark named fragments')
+    ap.add_argument('--repositories', '-n', type=int, action='append',
+                    help='Aliased repositories. Default: 1, 10, 100, 1000')
+    ap.add_argument('--repeat', '-r', type=int, default=5,
+                    help='Number of repetitions, the best is reported.')
+    args = ap.parse_args()
+
+    for repositories in args.repositories or (1, 10, 100, 1000):
+        bench(repositories, args.repeat)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+'''
+Rendering benchmark
+~~~~~~~~~~~~~~~~~~~
+
+Measures the time to render operations to GraphQL text, varying the
+number of selections and the depth of the selection tree. Each level
+selects its child and ``count`` aliased scalar fields, thus deep trees
+with many selections resemble generated operations.
+
+The operation text is cached until it's changed, so it's rendered
+using ``__to_graphql__()`` of its selection list, as done for the
+operation itself. The size of the compact text (no indentation) and of
+the minified ``bytes()`` sent by endpoints are also reported.
+
+Usage::
+
+   $ PYTHONPATH=. python3 utils/benchmark/render.py --count 1000
+
+:license: ISC
+'''
+
+import argparse
+import sys
+import time
+
+from sgqlc.types import Type, Field
+from sgqlc.operation import Operation, minify
+
+
+class Item(Type):
+    value = int
+    child = Field('Item', args={'first': int})
+
+
+class Query(Type):
+    item = Item
+
+
+def gen_operation(count, depth):
+    op = Operation(Query)
+    sel = op.item
+    for i in range(depth):
+        for j in range(count):
+            sel.value(__alias__='v%d' % j)
+        sel = sel.child(first=i)
+    sel.value()
+    return op
+
+
+def bench(count, depth, repeat):
+    op = gen_operation(count, depth)
+    selection_list = op.item().__selection_list__
+    n = count * depth + 1
+    loops = max(1, 10000 // n)  # small trees are rendered many times
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            text = selection_list.__to_graphql__(1)
+        elapsed = (time.perf_counter() - t0) / loops
+        best = elapsed if best is None else min(best, elapsed)
+    compact = selection_list.__to_graphql__(indent_string='')
+    t0 = time.perf_counter()
+    minified = minify(compact)
+    minify_elapsed = time.perf_counter() - t0
+    sys.stdout.write(
+        '%6d selections %4d depth %8.3fms total %8.3fus/selection\n' % (
+            n, depth, best * 1e3, best * 1e6 / n))
+    sys.stdout.write(
+        '%23s %8.3fms minify %9d bytes %9d compact %9d minified\n' % (
+            '', minify_elapsed * 1e3, len(text), len(compact), len(minified)))
+
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description='Benchmark rendering')
+    ap.add_argument('--count', '-c', type=int, action='append',
+                    help='Aliased selections per level. Default: 1, 10, 100')
+    ap.add_argument('--depth', '-d', type=int, action='append',
+                    help='Depth of the selection tree. Default: 10, 100, 400')
+    ap.add_argument('--repeat', '-r', type=int, default=5,
+                    help='Number of repetitions, the best is reported.')
+    args = ap.parse_args()
+
+    for depth in args.depth or (10, 100, 400):
+        for count in args.count or (1, 10, 100):
+            bench(count, depth, args.repeat)
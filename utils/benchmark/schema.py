@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+
+'''
+Schema declaration benchmark
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Measures the time and memory to declare a large schema, simulating a
+generated module with thousands of types (or loading it from a
+snapshot), the time to use a few of them, to render the whole schema
+and the cost of creating schemas on top of it (ie: one per tenant).
+
+Memory is measured by a second declaration traced with
+:mod:`tracemalloc`, so tracing does not affect the timings. The
+shallow size (:func:`sys.getsizeof`) of fields, their arguments and
+the fields tables of types is also reported, objects shared by many
+types are only counted once.
+
+Usage::
+
+   $ PYTHONPATH=. python3 utils/benchmark/schema.py --types 3000
+
+:license: ISC
+'''
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+
+from sgqlc.operation import Operation
+
+
+def gen_source(n, fields=10, strings=False):
+    '''Python source declaring ``n`` types in the schema ``schema``.
+
+    Each type has some scalar fields, a field with arguments and
+    references to previously declared types, by name if ``strings``.
+    '''
+    ref = "Field('%s')" if strings else '%s'
+    s = [
+        'from sgqlc.types import Type, Enum, Field, list_of, non_null',
+        'from sgqlc.types import String, Int, Boolean',
+        '',
+        'class State(Enum):',
+        '    __schema__ = schema',
+        "    __choices__ = ('OPEN', 'CLOSED')",
+        '',
+    ]
+    for i in range(n):
+        s.append('class Type%d(Type):' % i)
+        s.append('    __schema__ = schema')
+        s.append('    id = non_null(id)')
+        s.append('    state = ' + ref % 'State')
+        for j in range(fields - 4):
+            scalar = ('String', 'Int', 'Boolean')[j % 3]
+            s.append('    field%d = %s' % (j, ref % scalar))
+        s.append("    items = Field(list_of(str), args={'first': int})")
+        if i:
+            s.append('    parent = ' + ref % ('Type%d' % (i // 2)))
+        s.append('')
+    s.append('class Query(Type):')
+    s.append('    __schema__ = schema')
+    s.append('    node = Type%d' % (n - 1))
+    return '\n'.join(s)
+
+
+def use(namespace, count=5):
+    op = Operation(namespace['Query'])
+    sel = op.node
+    for _ in range(count - 1):
+        sel = sel.parent
+    sel.__fields__()
+    return bytes(op)
+
+
+def best_of(func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def resolve(schema):
+    from sgqlc.types import ContainerTypeMeta
+
+    for t in schema:
+        if isinstance(t, ContainerTypeMeta):
+            for f in t:
+                f.type
+
+
+def sizes(schema):
+    '''Shallow sizes of fields, arguments and fields tables.'''
+    from sgqlc.types import ContainerTypeMeta
+
+    seen = set()
+    totals = {'tables': 0, 'fields': 0, 'args': 0}
+
+    def add(kind, obj):
+        if id(obj) not in seen:
+            seen.add(id(obj))
+            totals[kind] += sys.getsizeof(obj)
+
+    for t in schema:
+        if isinstance(t, ContainerTypeMeta):
+            add('tables', t._ContainerTypeMeta__fields)
+            for f in t:
+                add('fields', f)
+                add('args', f.args)
+                for a in f.args.values():
+                    add('args', a)
+    return totals
+
+
+def bench_layers(schema, count):
+    from sgqlc.types import Schema
+
+    t0 = time.perf_counter()
+    layers = [Schema(schema) for _ in range(count)]
+    elapsed = time.perf_counter() - t0
+    del layers
+    size = traced(lambda: [Schema(schema) for _ in range(count)])[1]
+    sys.stdout.write(
+        '%-10s %8.3fs create %8.3fus/schema %8d bytes/schema\n' % (
+            '', elapsed, elapsed * 1e6 / count, size / count))
+
+
+def traced(func):
+    '''Call ``func()`` returning its result and allocated bytes.'''
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def declare(code, schema_kwargs):
+    from sgqlc.types import Schema
+
+    namespace = {'schema': Schema(**schema_kwargs)}
+    exec(code, namespace)
+    return namespace
+
+
+def bench(label, code, schema_kwargs, n, schemas, snapshot=False):
+    from sgqlc.types.snapshot import dumps, loads
+
+    declared = best_of(lambda: declare(code, schema_kwargs))
+    namespace, size = traced(lambda: declare(code, schema_kwargs))
+
+    if snapshot:
+        data = dumps(namespace['schema'])
+        declared = best_of(lambda: loads(data))
+        schema, size = traced(lambda: loads(data))
+        namespace = {'schema': schema, 'Query': schema.Query}
+        sys.stdout.write('%-10s %8d bytes snapshot\n' % ('', len(data)))
+
+    t0 = time.perf_counter()
+    use(namespace)
+    used = time.perf_counter() - t0
+    schema = namespace['schema']
+    resolved = best_of(lambda: resolve(schema))
+    render = best_of(lambda: bytes(schema))
+    size_of = sizes(schema)
+
+    sys.stdout.write('%-10s %8.3fs declare %8.3fus/type %8d bytes/type\n' % (
+        label, declared, declared * 1e6 / n, size / n))
+    sys.stdout.write(
+        '%-10s %8.3fs first use %8.3fs resolve %8.3fs render\n' % (
+            '', used, resolved, render))
+    sys.stdout.write('%-10s %8d tables %8d fields %8d args bytes/type\n' % (
+        '', size_of['tables'] / n, size_of['fields'] / n,
+        size_of['args'] / n))
+    bench_layers(schema, schemas)
+
+
+# mode: (schema keyword arguments, reference types by name, snapshot)
+modes = {
+    'eager': ({}, False, False),
+    'deferred': ({'deferred': True}, False, False),
+    'strings': ({}, True, False),
+    'snapshot': ({}, False, True),
+}
+
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description='Benchmark schema declaration')
+    ap.add_argument('--types', '-t', type=int, default=3000,
+                    help='Number of types to declare.')
+    ap.add_argument('--schemas', '-s', type=int, default=100,
+                    help='Number of schemas to create on top of it.')
+    ap.add_argument('--mode', '-m', action='append', choices=modes.keys(),
+                    help='Schema modes to benchmark. Default: all')
+    args = ap.parse_args()
+
+    for mode in args.mode or modes.keys():
+        schema_kwargs, strings, snapshot = modes[mode]
+        code = compile(gen_source(args.types, strings=strings), '<schema>',
+                       'exec')
+        bench(mode, code, schema_kwargs, args.types, args.schemas, snapshot)